@@ -0,0 +1,158 @@
+"""Vectorized NumPy rollouts that play many Kuhn hands at once.
+
+The tables here are array views of ``kuhn_poker.tables``, so the
+batched rules always match ``KuhnPokerAECEnv``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from typing import Final
+
+import numpy as np
+
+from kuhn_poker import tables
+from kuhn_poker.constants import ACTION_DIM, CARD_J, CARD_K, Action
+from kuhn_poker.generated.contract import INITIAL_ACTOR, PLAYER_INDEX_BY_ID
+from kuhn_poker.tables import HandPhase
+
+# (private_cards, history_ids, legal_masks, rng) -> actions, for the hands a player acts in.
+BatchPolicy = Callable[[np.ndarray, np.ndarray, np.ndarray, np.random.Generator], np.ndarray]
+
+
+def _build_tables() -> tuple[np.ndarray, ...]:
+    """Convert the tuple tables in ``kuhn_poker.tables`` into read-only arrays."""
+    deal_table = np.array(tables.DEAL_TABLE, dtype=np.int8)
+    legal_mask_by_history = np.stack(tables.LEGAL_MASK_BY_HISTORY)
+    next_history_by_action = np.array(
+        [
+            [
+                tables.NO_HISTORY if transition is None else transition.next_history_id
+                for transition in row
+            ]
+            for row in tables.TRANSITIONS
+        ],
+        dtype=np.int64,
+    )
+    is_terminal_history = np.array(tables.IS_TERMINAL_BY_HISTORY, dtype=bool)
+    facing_bet_by_history = np.array(
+        [
+            phase in (HandPhase.P0_RESPONSE, HandPhase.P1_RESPONSE)
+            for _, phase in tables.HISTORY_NODES
+        ],
+        dtype=bool,
+    )
+    # terminal_rewards[history_id, p0_has_higher_card] -> (p0_reward, p1_reward).
+    terminal_rewards = np.zeros((len(tables.HISTORY_NODES), 2, 2), dtype=np.float64)
+    for (history_id, p0_wins), payoff in tables.TERMINAL_REWARDS.items():
+        terminal_rewards[history_id, int(p0_wins)] = payoff
+
+    arrays = (
+        deal_table,
+        legal_mask_by_history,
+        next_history_by_action,
+        is_terminal_history,
+        facing_bet_by_history,
+        terminal_rewards,
+    )
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+# Longest action sequence in a hand; a batched rollout never takes more steps.
+MAX_HISTORY_DEPTH: Final[int] = max(len(sequence) for sequence, _ in tables.HISTORY_NODES)
+
+(
+    DEAL_TABLE,  # int8[deal, 2]: (player_0, player_1) card indices.
+    LEGAL_MASK_BY_HISTORY,  # int8[history_id, action]: 1 where the action is legal.
+    NEXT_HISTORY_BY_ACTION,  # int64[history_id, action]: next history, or NO_HISTORY.
+    IS_TERMINAL_HISTORY,  # bool[history_id]: the hand is over.
+    FACING_BET_BY_HISTORY,  # bool[history_id]: the actor must call or fold.
+    TERMINAL_REWARDS,  # float64[history_id, p0_has_higher_card, player]: payoffs.
+) = _build_tables()
+
+
+def _first_legal_actions(legal_masks: np.ndarray) -> np.ndarray:
+    return np.argmax(legal_masks != 0, axis=1)
+
+
+def random_legal_policy(
+    private_cards: np.ndarray,
+    history_ids: np.ndarray,
+    legal_masks: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Sample uniformly from each row's legal actions."""
+    del private_cards, history_ids
+    legal_counts = np.count_nonzero(legal_masks, axis=1)
+    if np.any(legal_counts == 0):
+        raise ValueError("No legal actions available.")
+    picks = rng.integers(legal_counts)
+    return np.argmax(np.cumsum(legal_masks != 0, axis=1) > picks[:, None], axis=1)
+
+
+def heuristic_policy(
+    private_cards: np.ndarray,
+    history_ids: np.ndarray,
+    legal_masks: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Batched ``simple_heuristic_action``: bet kings, fold jacks to a bet, else check/call."""
+    del rng
+    if np.any(~legal_masks.any(axis=1)):
+        raise ValueError("No legal actions available.")
+
+    can_call = legal_masks[:, Action.CHECK_OR_CALL] == 1
+    actions = np.where(can_call, int(Action.CHECK_OR_CALL), _first_legal_actions(legal_masks))
+
+    facing_bet = FACING_BET_BY_HISTORY[history_ids]
+    fold = facing_bet & (private_cards == CARD_J) & (legal_masks[:, Action.FOLD] == 1)
+    bet = ~facing_bet & (private_cards == CARD_K) & (legal_masks[:, Action.BET] == 1)
+    actions[fold] = int(Action.FOLD)
+    actions[bet] = int(Action.BET)
+    return actions
+
+
+def deal_batch(num_hands: int, rng: np.random.Generator) -> np.ndarray:
+    """Deal ``num_hands`` hands as an ``int8[num_hands, 2]`` array of card indices."""
+    return DEAL_TABLE[rng.integers(len(DEAL_TABLE), size=num_hands)]
+
+
+def run_hands_batch(
+    num_hands: int,
+    rng: np.random.Generator,
+    policies: Sequence[BatchPolicy] = (random_legal_policy, random_legal_policy),
+) -> np.ndarray:
+    """Play ``num_hands`` independent hands; return per-hand rewards as ``float[num_hands, 2]``.
+
+    ``policies[i]`` chooses actions for player ``i``.
+    """
+    cards = deal_batch(num_hands, rng)
+    history_ids = np.full(num_hands, tables.INITIAL_HISTORY_ID, dtype=np.int64)
+    actor_id = PLAYER_INDEX_BY_ID[INITIAL_ACTOR]
+
+    # Players alternate, so every live hand has the same actor at a given depth.
+    live = np.flatnonzero(~IS_TERMINAL_HISTORY[history_ids])
+    for _ in range(MAX_HISTORY_DEPTH):
+        if not live.size:
+            break
+        live_histories = history_ids[live]
+        legal_masks = LEGAL_MASK_BY_HISTORY[live_histories]
+        actions = np.asarray(
+            policies[actor_id](cards[live, actor_id], live_histories, legal_masks, rng)
+        )
+        if actions.shape != live.shape or np.any((actions < 0) | (actions >= ACTION_DIM)):
+            raise ValueError("Batch policy returned out-of-range actions.")
+        next_histories = NEXT_HISTORY_BY_ACTION[live_histories, actions]
+        if np.any(next_histories == tables.NO_HISTORY):
+            raise ValueError("Batch policy selected an illegal action.")
+
+        history_ids[live] = next_histories
+        actor_id = 1 - actor_id
+        live = live[~IS_TERMINAL_HISTORY[next_histories]]
+    if live.size:
+        raise RuntimeError(f"Hands still live after {MAX_HISTORY_DEPTH} actions.")
+
+    p0_wins_showdown = (cards[:, 0] > cards[:, 1]).astype(np.int64)
+    return TERMINAL_REWARDS[history_ids, p0_wins_showdown]
@@ -20,6 +20,8 @@ class Action(IntEnum):
 
 ACTION_DIM: Final[int] = _ACTION_DIM
 AGENT_NAMES: Final[tuple[str, str]] = (PLAYERS[0], PLAYERS[1])
+# Seat index of each agent, for per-seat arrays such as hand returns.
+AGENT_INDEX: Final[dict[str, int]] = {agent: seat for seat, agent in enumerate(AGENT_NAMES)}
 CARD_LABELS: Final[tuple[str, str, str]] = (CARDS[0], CARDS[1], CARDS[2])
 
 CARD_J: Final[int] = CARD_INDEX_BY_LABEL["J"]
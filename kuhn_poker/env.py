@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from enum import Enum
-from typing import Optional
+from collections.abc import Mapping
+from typing import Final, NamedTuple, Optional
 
 import numpy as np
 from gymnasium import spaces
@@ -11,32 +11,70 @@ from gymnasium.utils import seeding
 from pettingzoo import AECEnv
 
 from kuhn_poker.constants import ACTION_DIM, AGENT_NAMES, CARD_LABELS
-from kuhn_poker.generated.contract import (
-    ACTION_OPEN_LABEL_BY_ID,
-    ACTION_RESPONSE_LABEL_BY_ID,
-    INITIAL_ACTOR,
-    INITIAL_PHASE,
-    LEGAL_MASK_BY_PHASE,
-    OBS_ACTOR_OFFSET,
-    OBSERVATION_DIM,
-    OBS_HISTORY_INDEX_BY_SEQUENCE,
-    OBS_HISTORY_OFFSET,
-    OBS_PRIVATE_CARD_OFFSET,
-    OBS_TERMINAL_HISTORY_INDEX,
-    PLAYER_INDEX_BY_ID,
-    RESPONSE_ACTION_PHASES,
+from kuhn_poker.generated.contract import INITIAL_ACTOR, OBSERVATION_DIM, PLAYER_INDEX_BY_ID
+from kuhn_poker.tables import (
+    ANTE_CONTRIBUTIONS,
+    DEAL_TABLE,
+    HISTORY_NODES,
+    INITIAL_HISTORY_ID,
+    IS_TERMINAL_BY_HISTORY,
+    LEGAL_BITS_BY_HISTORY,
+    LEGAL_MASK_BY_HISTORY,
+    NO_LEGAL_ACTION_MASK,
+    OBS_HISTORY_INDEX_BY_HISTORY,
+    OBSERVATION_TABLE,
+    PHASE_NAME_BY_HISTORY,
+    TERMINAL_REWARDS,
+    TRANSITIONS,
+    WINNER_NONE,
+    HandPhase,
 )
 
+# Built once and shared by every env instance and agent. Note that sampling RNG
+# state lives on the space, so seeding one env's space seeds them all.
+ACTION_SPACE: Final[spaces.Discrete] = spaces.Discrete(ACTION_DIM)
+OBSERVATION_SPACE: Final[spaces.Dict] = spaces.Dict(
+    {
+        "observation": spaces.Box(low=0, high=1, shape=(OBSERVATION_DIM,), dtype=np.int8),
+        "action_mask": spaces.MultiBinary(ACTION_DIM),
+    }
+)
+
+
+class DecisionPoint(NamedTuple):
+    """One information state where a player must act, with what observe() shows them."""
+
+    private_card: int
+    history_id: int
+    actor_id: int
+    observation: np.ndarray
+    action_mask: np.ndarray
+
+
+def _build_decision_points() -> tuple[DecisionPoint, ...]:
+    initial_actor_id = PLAYER_INDEX_BY_ID[INITIAL_ACTOR]
+    points = []
+    for history_id, (sequence, _) in enumerate(HISTORY_NODES):
+        if IS_TERMINAL_BY_HISTORY[history_id]:
+            continue
+        actor_id = (initial_actor_id + len(sequence)) % len(AGENT_NAMES)
+        for card_index in range(len(CARD_LABELS)):
+            points.append(
+                DecisionPoint(
+                    private_card=card_index,
+                    history_id=history_id,
+                    actor_id=actor_id,
+                    observation=OBSERVATION_TABLE[
+                        (card_index, OBS_HISTORY_INDEX_BY_HISTORY[history_id], actor_id)
+                    ],
+                    action_mask=LEGAL_MASK_BY_HISTORY[history_id],
+                )
+            )
+    return tuple(points)
 
-class HandPhase(str, Enum):
-    """Explicit phase machine for one Kuhn hand."""
 
-    DEAL = "deal"
-    P0_ACT = "p0_act"
-    P1_ACT = "p1_act"
-    P0_RESPONSE = "p0_response"
-    P1_RESPONSE = "p1_response"
-    TERMINAL = "terminal"
+# Every decision a live player can face in one hand; small enough to enumerate exhaustively.
+DECISION_POINTS: Final[tuple[DecisionPoint, ...]] = _build_decision_points()
 
 
 class KuhnPokerAECEnv(AECEnv):
@@ -54,37 +92,69 @@ class KuhnPokerAECEnv(AECEnv):
         self.possible_agents = list(AGENT_NAMES)
         self.agents: list[str] = []
 
-        self._action_spaces = {
-            agent: spaces.Discrete(ACTION_DIM) for agent in self.possible_agents
-        }
+        self._action_spaces = {agent: ACTION_SPACE for agent in self.possible_agents}
         self._observation_spaces = {
-            agent: spaces.Dict(
-                {
-                    "observation": spaces.Box(
-                        low=0, high=1, shape=(OBSERVATION_DIM,), dtype=np.int8
-                    ),
-                    "action_mask": spaces.MultiBinary(ACTION_DIM),
-                }
-            )
-            for agent in self.possible_agents
+            agent: OBSERVATION_SPACE for agent in self.possible_agents
         }
 
         self.np_random, _ = seeding.np_random(None)
 
-        self.private_cards: dict[str, int] = {}
-        self.history: list[str] = []
-        self.last_bettor: Optional[str] = None
-        self.contributions: dict[str, int] = {}
-        self.phase = HandPhase.DEAL
+        # Per-player state is kept in slots indexed by player id (0/1); the
+        # agent-keyed dicts below are views built on demand for callers.
+        self._private_cards: list[int] = []
+        self._contributions: list[int] = []
+        self._last_bettor: Optional[int] = None
+        self._history_id = INITIAL_HISTORY_ID
 
-        self.rewards: dict[str, float] = {}
-        self._cumulative_rewards: dict[str, float] = {}
+        self._reward_slots = [0.0, 0.0]
+        self._cumulative_reward_slots = [0.0, 0.0]
         self.terminations: dict[str, bool] = {}
         self.truncations: dict[str, bool] = {}
         self.infos: dict[str, dict[str, object]] = {}
 
         self.agent_selection = INITIAL_ACTOR
 
+    # PettingZoo reads and deletes from these dicts; views over live agents keep
+    # that working while steps only touch the slots.
+    @property
+    def rewards(self) -> dict[str, float]:
+        return {agent: self._reward_slots[PLAYER_INDEX_BY_ID[agent]] for agent in self.agents}
+
+    @property
+    def _cumulative_rewards(self) -> dict[str, float]:
+        return {
+            agent: self._cumulative_reward_slots[PLAYER_INDEX_BY_ID[agent]]
+            for agent in self.agents
+        }
+
+    @property
+    def private_cards(self) -> dict[str, int]:
+        return dict(zip(self.possible_agents, self._private_cards))
+
+    @private_cards.setter
+    def private_cards(self, cards: Mapping[str, int]) -> None:
+        self._private_cards = [int(cards[agent]) for agent in self.possible_agents]
+
+    @property
+    def contributions(self) -> dict[str, int]:
+        return dict(zip(self.possible_agents, self._contributions))
+
+    @property
+    def history(self) -> list[str]:
+        return list(HISTORY_NODES[self._history_id][0])
+
+    @property
+    def phase(self) -> HandPhase:
+        if not self._private_cards:
+            return HandPhase.DEAL
+        return HISTORY_NODES[self._history_id][1]
+
+    @property
+    def last_bettor(self) -> Optional[str]:
+        if self._last_bettor is None:
+            return None
+        return self.possible_agents[self._last_bettor]
+
     def observation_space(self, agent: str) -> spaces.Space:
         return self._observation_spaces[agent]
 
@@ -97,41 +167,56 @@ class KuhnPokerAECEnv(AECEnv):
             self.np_random, _ = seeding.np_random(seed)
 
         self.agents = self.possible_agents[:]
-        self.rewards = {agent: 0.0 for agent in self.agents}
-        self._cumulative_rewards = {agent: 0.0 for agent in self.agents}
+        self._reward_slots = [0.0, 0.0]
+        self._cumulative_reward_slots = [0.0, 0.0]
         self.terminations = {agent: False for agent in self.agents}
         self.truncations = {agent: False for agent in self.agents}
+        self.infos = {agent: {} for agent in self.agents}
 
-        dealt = self.np_random.permutation(len(CARD_LABELS))[:2]
-        self.private_cards = {
-            self.possible_agents[0]: int(dealt[0]),
-            self.possible_agents[1]: int(dealt[1]),
-        }
-        self.contributions = {agent: 1 for agent in self.agents}
-        self.history = []
-        self.last_bettor = None
-
-        self.phase = HandPhase.DEAL
-        self._advance_from_deal()
+        self._private_cards = list(
+            DEAL_TABLE[int(self.np_random.integers(len(DEAL_TABLE)))]
+        )
+        self._contributions = list(ANTE_CONTRIBUTIONS)
+        self._history_id = INITIAL_HISTORY_ID
+        self._last_bettor = None
         self.agent_selection = INITIAL_ACTOR
         self._sync_infos()
 
-    def observe(self, agent: str) -> dict[str, np.ndarray]:
-        observation = np.zeros(OBSERVATION_DIM, dtype=np.int8)
-
-        if agent in self.private_cards:
-            card_index = self.private_cards[agent]
-            observation[OBS_PRIVATE_CARD_OFFSET + card_index] = 1
+    def quick_reset(self) -> None:
+        """Deal the next hand like an unseeded ``reset()``, reusing this env's containers.
 
-        history_index = self._history_index()
-        observation[OBS_HISTORY_OFFSET + history_index] = 1
+        The deal comes from the same ``np_random`` stream, so a run of quick resets
+        plays the same hands as the equivalent run of ``reset()`` calls.
+        """
+        if not self._private_cards:
+            self.reset()
+            return
 
-        actor_index = self._current_actor_index()
-        if actor_index is not None:
-            observation[OBS_ACTOR_OFFSET + actor_index] = 1
+        self.agents[:] = self.possible_agents
+        self._clear_rewards()
+        self._cumulative_reward_slots[0] = 0.0
+        self._cumulative_reward_slots[1] = 0.0
+        # Finished agents were dropped from these dicts; putting them back is enough.
+        for agent in self.possible_agents:
+            self.terminations[agent] = False
+            self.truncations[agent] = False
+            self.infos.setdefault(agent, {})
+
+        self._private_cards[:] = DEAL_TABLE[int(self.np_random.integers(len(DEAL_TABLE)))]
+        self._contributions[:] = ANTE_CONTRIBUTIONS
+        self._history_id = INITIAL_HISTORY_ID
+        self._last_bettor = None
+        self.agent_selection = INITIAL_ACTOR
+        self._sync_infos()
 
+    def observe(self, agent: str) -> dict[str, np.ndarray]:
+        key = (
+            self._private_cards[PLAYER_INDEX_BY_ID[agent]] if self._private_cards else None,
+            self._history_index(),
+            self._current_actor_index(),
+        )
         return {
-            "observation": observation,
+            "observation": OBSERVATION_TABLE[key],
             "action_mask": self._legal_action_mask(agent),
         }
 
@@ -143,29 +228,49 @@ class KuhnPokerAECEnv(AECEnv):
             return
 
         agent = self.agent_selection
+        agent_id = PLAYER_INDEX_BY_ID[agent]
         self._clear_rewards()
-        self._cumulative_rewards[agent] = 0.0
+        self._cumulative_reward_slots[agent_id] = 0.0
 
-        legal_mask = self._legal_action_mask(agent)
         if action is None:
             raise ValueError("Live agent must provide an action.")
 
+        # A live agent's legal actions are exactly the non-None transitions from
+        # the current history, so the mask is only materialized for the error.
         action = int(action)
-        if action < 0 or action >= ACTION_DIM or legal_mask[action] == 0:
+        transition = TRANSITIONS[self._history_id][action] if 0 <= action < ACTION_DIM else None
+        if transition is None:
             raise ValueError(
-                f"Illegal action {action} for agent {agent}. Legal mask: {legal_mask.tolist()}"
+                f"Illegal action {action} for agent {agent}. "
+                f"Legal mask: {self._legal_action_mask(agent).tolist()}"
             )
 
-        token = self._action_token(action)
-        self._apply_action_effects(agent, token)
-        winner = self._advance_phase(agent, token)
-        if winner is not None:
-            self._set_terminal_rewards(winner)
+        self._history_id = transition.next_history_id
+        self._contributions[agent_id] += transition.contribution
+        if transition.sets_last_bettor:
+            self._last_bettor = agent_id
+        self.agent_selection = self._next_agent(agent_id)
+
+        if transition.winner_rule != WINNER_NONE:
+            self._set_terminal_rewards()
             self.terminations = {name: True for name in self.agents}
 
         self._sync_infos()
         self._accumulate_rewards()
 
+    def last(
+        self, observe: bool = True
+    ) -> tuple[Optional[dict[str, np.ndarray]], float, bool, bool, dict[str, object]]:
+        agent = self.agent_selection
+        observation = self.observe(agent) if observe else None
+        return (
+            observation,
+            self._cumulative_reward_slots[PLAYER_INDEX_BY_ID[agent]],
+            self.terminations[agent],
+            self.truncations[agent],
+            self.infos[agent],
+        )
+
     def render(self) -> None:
         if self.render_mode != "human":
             return
@@ -179,102 +284,47 @@ class KuhnPokerAECEnv(AECEnv):
         return
 
     def _legal_action_mask(self, agent: str) -> np.ndarray:
+        # Agents missing from terminations (before reset, or already removed) have no moves.
         if (
             agent != self.agent_selection
-            or self.terminations.get(agent, False)
+            or self.terminations.get(agent, True)
             or self.truncations.get(agent, False)
         ):
-            return np.zeros(ACTION_DIM, dtype=np.int8)
-        return np.asarray(LEGAL_MASK_BY_PHASE[self.phase.value], dtype=np.int8)
-
-    def _action_token(self, action: int) -> str:
-        labels = (
-            ACTION_RESPONSE_LABEL_BY_ID
-            if self.phase.value in RESPONSE_ACTION_PHASES
-            else ACTION_OPEN_LABEL_BY_ID
-        )
-        return labels[action]
+            return NO_LEGAL_ACTION_MASK
+        return LEGAL_MASK_BY_HISTORY[self._history_id]
 
-    def _showdown_winner(self) -> str:
-        p0, p1 = self.possible_agents
-        return p0 if self.private_cards[p0] > self.private_cards[p1] else p1
+    def _set_terminal_rewards(self) -> None:
+        p0_reward, p1_reward = TERMINAL_REWARDS[
+            (self._history_id, self._private_cards[0] > self._private_cards[1])
+        ]
+        self._reward_slots[0] = p0_reward
+        self._reward_slots[1] = p1_reward
 
-    def _set_terminal_rewards(self, winner: Optional[str]) -> None:
-        if winner is None:
-            return
-        loser = self.possible_agents[0] if winner == self.possible_agents[1] else self.possible_agents[1]
-        pot = sum(self.contributions.values())
-        self.rewards[winner] = float(pot - self.contributions[winner])
-        self.rewards[loser] = float(-self.contributions[loser])
-
-    def _next_agent(self, current_agent: str) -> str:
-        if current_agent == self.possible_agents[0]:
-            return self.possible_agents[1]
-        return self.possible_agents[0]
-
-    def _advance_from_deal(self) -> None:
-        if self.phase != HandPhase.DEAL:
-            raise RuntimeError(f"Cannot advance from non-deal phase: {self.phase}")
-        self.phase = HandPhase(INITIAL_PHASE)
-        self.agent_selection = INITIAL_ACTOR
+    def _clear_rewards(self) -> None:
+        self._reward_slots[0] = 0.0
+        self._reward_slots[1] = 0.0
 
-    def _apply_action_effects(self, agent: str, token: str) -> None:
-        if token in ("bet", "call"):
-            self.contributions[agent] += 1
-        if token == "bet":
-            self.last_bettor = agent
-        self.history.append(token)
-
-    def _advance_phase(self, agent: str, token: str) -> Optional[str]:
-        p0, p1 = self.possible_agents
-
-        if self.phase == HandPhase.P0_ACT:
-            if token == "check":
-                self.phase = HandPhase.P1_ACT
-                self.agent_selection = p1
-                return None
-            if token == "bet":
-                self.phase = HandPhase.P1_RESPONSE
-                self.agent_selection = p1
-                return None
-
-        elif self.phase == HandPhase.P1_ACT:
-            if token == "check":
-                self.phase = HandPhase.TERMINAL
-                self.agent_selection = p0
-                return self._showdown_winner()
-            if token == "bet":
-                self.phase = HandPhase.P0_RESPONSE
-                self.agent_selection = p0
-                return None
-
-        elif self.phase in (HandPhase.P0_RESPONSE, HandPhase.P1_RESPONSE):
-            self.phase = HandPhase.TERMINAL
-            self.agent_selection = self._next_agent(agent)
-            if token == "call":
-                return self._showdown_winner()
-            if token == "fold":
-                return self.last_bettor
-
-        raise RuntimeError(
-            f"Invalid transition. phase={self.phase.value}, token={token}, agent={agent}"
-        )
+    def _accumulate_rewards(self) -> None:
+        self._cumulative_reward_slots[0] += self._reward_slots[0]
+        self._cumulative_reward_slots[1] += self._reward_slots[1]
+
+    def _next_agent(self, agent_id: int) -> str:
+        return self.possible_agents[1 - agent_id]
 
     def _sync_infos(self) -> None:
-        self.infos = {
-            agent: {
-                "action_mask": self._legal_action_mask(agent),
-                "phase": self.phase.value,
-            }
-            for agent in self.possible_agents
-        }
+        # Info dicts live for the whole hand; only their values are refreshed.
+        phase = PHASE_NAME_BY_HISTORY[self._history_id]
+        legal_bits = LEGAL_BITS_BY_HISTORY[self._history_id]
+        for agent, info in self.infos.items():
+            mask = self._legal_action_mask(agent)
+            info["action_mask"] = mask
+            info["action_mask_bits"] = 0 if mask is NO_LEGAL_ACTION_MASK else legal_bits
+            info["phase"] = phase
 
     def _history_index(self) -> int:
-        return OBS_HISTORY_INDEX_BY_SEQUENCE.get(
-            tuple(self.history), OBS_TERMINAL_HISTORY_INDEX
-        )
+        return OBS_HISTORY_INDEX_BY_HISTORY[self._history_id]
 
     def _current_actor_index(self) -> Optional[int]:
-        if self.phase == HandPhase.TERMINAL:
+        if IS_TERMINAL_BY_HISTORY[self._history_id]:
             return None
         return PLAYER_INDEX_BY_ID[self.agent_selection]
@@ -8,6 +8,8 @@ from __future__ import annotations
 
 from typing import Final
 
+import numpy as _np
+
 CONTRACT_NAME: Final[str] = 'kuhn_poker'
 CONTRACT_VERSION: Final[str] = '1.0.0'
 
@@ -29,6 +31,16 @@ ACTION_OPEN_LABEL_BY_ID: Final[dict[int, str]] = {0: 'check', 1: 'bet', 2: 'fold
 ACTION_RESPONSE_LABEL_BY_ID: Final[dict[int, str]] = {0: 'call', 1: 'bet', 2: 'fold'}
 LEGAL_MASK_BY_PHASE: Final[dict[str, tuple[int, ...]]] = {'deal': (0, 0, 0), 'p0_act': (1, 1, 0), 'p1_act': (1, 1, 0), 'p0_response': (1, 0, 1), 'p1_response': (1, 0, 1), 'terminal': (0, 0, 0)}
 
+PHASE_INDEX_BY_NAME: Final[dict[str, int]] = {phase: index for index, phase in enumerate(PHASES)}
+# Row PHASE_INDEX_BY_NAME[phase] is that phase's mask; read-only, shared by all callers.
+LEGAL_MASK_MATRIX: Final[_np.ndarray] = _np.array(
+    [LEGAL_MASK_BY_PHASE[phase] for phase in PHASES], dtype=_np.int8
+)
+LEGAL_MASK_MATRIX.setflags(write=False)
+# Bit i is set when action id i is legal: (bits >> action_id) & 1.
+LEGAL_MASK_BITS_BY_PHASE: Final[dict[str, int]] = {'deal': 0, 'p0_act': 3, 'p1_act': 3, 'p0_response': 5, 'p1_response': 5, 'terminal': 0}
+LEGAL_MASK_BITS_BY_PHASE_INDEX: Final[tuple[int, ...]] = tuple(LEGAL_MASK_BITS_BY_PHASE[phase] for phase in PHASES)
+
 OBSERVATION_DIM: Final[int] = 10
 OBS_PRIVATE_CARD_OFFSET: Final[int] = 0
 OBS_PRIVATE_CARD_DIM: Final[int] = 3
@@ -37,7 +49,9 @@ OBS_HISTORY_DIM: Final[int] = 5
 OBS_ACTOR_OFFSET: Final[int] = 8
 OBS_ACTOR_DIM: Final[int] = 2
 OBS_HISTORY_BUCKETS: Final[tuple[tuple[int, tuple[str, ...] | None], ...]] = ((0, ()), (1, ('check',)), (2, ('bet',)), (3, ('check', 'bet')), (4, None))
-OBS_HISTORY_INDEX_BY_SEQUENCE: Final[dict[tuple[str, ...], int]] = {(): 0, ('check',): 1, ('bet',): 2, ('check', 'bet'): 3}
+OBS_HISTORY_KEY_SEPARATOR: Final[str] = '|'
+# Keyed by OBS_HISTORY_KEY_SEPARATOR.join(public_action_tokens).
+OBS_HISTORY_INDEX_BY_SEQUENCE: Final[dict[str, int]] = {'': 0, 'check': 1, 'bet': 2, 'check|bet': 3}
 OBS_TERMINAL_HISTORY_INDEX: Final[int] = 4
 
 CARD_INDEX_BY_LABEL: Final[dict[str, int]] = {label: index for index, label in enumerate(CARDS)}
@@ -1,4 +1,4 @@
-"""Utilities for exporting MaskablePPO policies to ONNX."""
+"""Utilities for exporting MaskablePPO policies to ONNX (and TorchScript)."""
 
 from __future__ import annotations
 
@@ -19,13 +19,38 @@ DEFAULT_ONNX_OPSET: Final[int] = 17
 _ILLEGAL_LOGIT: Final[float] = -1e9
 
 
+def _policy_io_dims(model: MaskablePPO) -> tuple[int, int]:
+    observation_shape = model.observation_space.shape
+    if observation_shape is None:
+        raise ValueError("Model observation space shape is undefined.")
+    if len(observation_shape) != 1:
+        raise ValueError(
+            f"Expected flat 1D observations for export, got shape={observation_shape}."
+        )
+    if not hasattr(model.action_space, "n"):
+        raise ValueError("Expected discrete action space for export.")
+    return int(observation_shape[0]), int(model.action_space.n)
+
+
 class MaskablePolicyExportModule(torch.nn.Module):
     """Torch module that exposes masked logits and value for ONNX export."""
 
+    dummy_observation: torch.Tensor
+    dummy_action_mask: torch.Tensor
+
     def __init__(self, model: MaskablePPO) -> None:
         super().__init__()
         self.policy = model.policy
 
+        # Fixed-shape tracing inputs, kept out of the state dict.
+        obs_dim, action_dim = _policy_io_dims(model)
+        self.register_buffer(
+            "dummy_observation", torch.zeros((1, obs_dim), dtype=torch.float32), persistent=False
+        )
+        self.register_buffer(
+            "dummy_action_mask", torch.ones((1, action_dim), dtype=torch.float32), persistent=False
+        )
+
     def forward(
         self, observation: torch.Tensor, action_mask: torch.Tensor
     ) -> tuple[torch.Tensor, torch.Tensor]:
@@ -39,9 +64,7 @@ class MaskablePolicyExportModule(torch.nn.Module):
 
         logits = self.policy.action_net(latent_pi)
 
-        mask = action_mask.to(dtype=logits.dtype)
-        illegal_logits = torch.full_like(logits, _ILLEGAL_LOGIT)
-        masked_logits = torch.where(mask > 0.5, logits, illegal_logits)
+        masked_logits = logits.masked_fill(action_mask <= 0.5, _ILLEGAL_LOGIT)
 
         value = self.policy.value_net(latent_vf)
         return masked_logits, value
@@ -53,22 +76,7 @@ def export_maskable_ppo_to_onnx(
     opset_version: int = DEFAULT_ONNX_OPSET,
 ) -> Path:
     """Export a trained MaskablePPO checkpoint to ONNX."""
-    observation_shape = model.observation_space.shape
-    if observation_shape is None:
-        raise ValueError("Model observation space shape is undefined.")
-    if len(observation_shape) != 1:
-        raise ValueError(
-            f"Expected flat 1D observations for export, got shape={observation_shape}."
-        )
-    if not hasattr(model.action_space, "n"):
-        raise ValueError("Expected discrete action space for export.")
-
-    obs_dim = int(observation_shape[0])
-    action_dim = int(model.action_space.n)
-
     export_module = MaskablePolicyExportModule(model).eval().to("cpu")
-    dummy_observation = torch.zeros((1, obs_dim), dtype=torch.float32)
-    dummy_action_mask = torch.ones((1, action_dim), dtype=torch.float32)
 
     onnx_path = Path(onnx_path)
     onnx_path.parent.mkdir(parents=True, exist_ok=True)
@@ -76,7 +84,7 @@ def export_maskable_ppo_to_onnx(
     with torch.no_grad():
         torch.onnx.export(
             export_module,
-            (dummy_observation, dummy_action_mask),
+            (export_module.dummy_observation, export_module.dummy_action_mask),
             str(onnx_path),
             dynamo=False,
             input_names=[ONNX_INPUT_OBSERVATION_NAME, ONNX_INPUT_ACTION_MASK_NAME],
@@ -92,3 +100,18 @@ def export_maskable_ppo_to_onnx(
         )
 
     return onnx_path
+
+
+def export_maskable_ppo_to_torchscript(model: MaskablePPO, torchscript_path: Path) -> Path:
+    """Trace the export module to TorchScript, loadable without SB3 via ``torch.jit.load``."""
+    export_module = MaskablePolicyExportModule(model).eval().to("cpu")
+
+    torchscript_path = Path(torchscript_path)
+    torchscript_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with torch.no_grad():
+        traced = torch.jit.trace(
+            export_module, (export_module.dummy_observation, export_module.dummy_action_mask)
+        )
+    torch.jit.save(traced, str(torchscript_path))
+    return torchscript_path
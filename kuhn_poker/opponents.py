@@ -3,11 +3,36 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
-from typing import Optional
+from typing import Final, Optional
 
 import numpy as np
 
-from kuhn_poker.constants import CARD_J, CARD_K, Action
+from kuhn_poker.constants import ACTION_DIM, CARD_J, CARD_K, Action
+
+_CHECK_OR_CALL: Final[int] = int(Action.CHECK_OR_CALL)
+_BET: Final[int] = int(Action.BET)
+_FOLD: Final[int] = int(Action.FOLD)
+_CHECK_OR_CALL_BIT: Final[int] = 1 << _CHECK_OR_CALL
+_BET_BIT: Final[int] = 1 << _BET
+_FOLD_BIT: Final[int] = 1 << _FOLD
+
+
+# LEGAL_ACTIONS[bits]: the legal action ids, ascending, for packed mask bits (bit i = id i).
+LEGAL_ACTIONS: Final[tuple[tuple[int, ...], ...]] = tuple(
+    tuple(action for action in range(ACTION_DIM) if bits >> action & 1)
+    for bits in range(1 << ACTION_DIM)
+)
+
+
+def _legal_actions(action_mask: np.ndarray) -> tuple[int, ...]:
+    legal_actions = LEGAL_ACTIONS[
+        (_CHECK_OR_CALL_BIT if action_mask[_CHECK_OR_CALL] else 0)
+        | (_BET_BIT if action_mask[_BET] else 0)
+        | (_FOLD_BIT if action_mask[_FOLD] else 0)
+    ]
+    if not legal_actions:
+        raise ValueError("No legal actions available.")
+    return legal_actions
 
 
 def sample_random_legal_action(
@@ -17,31 +42,26 @@ def sample_random_legal_action(
     if rng is None:
         rng = np.random.default_rng()
 
-    legal_actions = np.flatnonzero(action_mask)
-    if len(legal_actions) == 0:
-        raise ValueError("No legal actions available.")
-    return int(rng.choice(legal_actions))
+    legal_actions = _legal_actions(action_mask)
+    return legal_actions[int(rng.integers(len(legal_actions)))]
 
 
 def simple_heuristic_action(
     private_card: int, public_history: Sequence[str], action_mask: np.ndarray
 ) -> int:
     """A tiny baseline strategy for quick checks."""
-    legal_actions = np.flatnonzero(action_mask)
-    if len(legal_actions) == 0:
-        raise ValueError("No legal actions available.")
-
-    facing_bet = tuple(public_history) in (("bet",), ("check", "bet"))
+    # Only one bet is allowed per hand, so a live history ending in "bet" is facing it.
+    facing_bet = len(public_history) > 0 and public_history[-1] == "bet"
 
     if facing_bet:
-        if private_card == CARD_J and action_mask[Action.FOLD] == 1:
-            return int(Action.FOLD)
-        if action_mask[Action.CHECK_OR_CALL] == 1:
-            return int(Action.CHECK_OR_CALL)
-        return int(legal_actions[0])
-
-    if private_card == CARD_K and action_mask[Action.BET] == 1:
-        return int(Action.BET)
-    if action_mask[Action.CHECK_OR_CALL] == 1:
-        return int(Action.CHECK_OR_CALL)
-    return int(legal_actions[0])
+        if private_card == CARD_J and action_mask[_FOLD] == 1:
+            return _FOLD
+        if action_mask[_CHECK_OR_CALL] == 1:
+            return _CHECK_OR_CALL
+        return _legal_actions(action_mask)[0]
+
+    if private_card == CARD_K and action_mask[_BET] == 1:
+        return _BET
+    if action_mask[_CHECK_OR_CALL] == 1:
+        return _CHECK_OR_CALL
+    return _legal_actions(action_mask)[0]
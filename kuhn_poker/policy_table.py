@@ -0,0 +1,107 @@
+"""A trained policy as a table of action distributions over every decision point.
+
+Kuhn has only a dozen decision points, so the table describes the policy
+completely. Evaluation and the CLI can act from it with NumPy alone.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+import numpy as np
+
+from kuhn_poker.batch_sim import BatchPolicy
+from kuhn_poker.constants import ACTION_DIM, CARD_LABELS
+from kuhn_poker.env import DECISION_POINTS
+from kuhn_poker.tables import HISTORY_NODES
+
+if TYPE_CHECKING:
+    from sb3_contrib import MaskablePPO
+
+# Saved next to the checkpoint: checkpoints/maskable_ppo_kuhn.policy.npy.
+POLICY_TABLE_SUFFIX: Final[str] = ".policy.npy"
+
+# Written by train.py after its exports: the sha256 of the checkpoint they came from.
+EXPORTS_DIGEST_SUFFIX: Final[str] = ".exports.sha256"
+
+# Model inputs for every decision point, in DECISION_POINTS order.
+DECISION_POINT_OBSERVATIONS: Final[np.ndarray] = np.stack(
+    [point.observation for point in DECISION_POINTS]
+)
+DECISION_POINT_MASKS: Final[np.ndarray] = np.stack(
+    [point.action_mask for point in DECISION_POINTS]
+)
+DECISION_POINT_OBSERVATIONS.setflags(write=False)
+DECISION_POINT_MASKS.setflags(write=False)
+
+
+def normalize_policy_table(probs: np.ndarray) -> np.ndarray:
+    """Return ``probs`` as float64 rows that sum to one; raise if it is not one row per point."""
+    probs = np.asarray(probs, dtype=np.float64)
+    if probs.shape != (len(DECISION_POINTS), ACTION_DIM):
+        raise ValueError(
+            f"Expected a policy table of shape {(len(DECISION_POINTS), ACTION_DIM)}, "
+            f"got {probs.shape}."
+        )
+    return probs / probs.sum(axis=1, keepdims=True)
+
+
+def decision_point_probabilities(model: MaskablePPO) -> np.ndarray:
+    """Return ``model``'s masked action distribution at each of ``DECISION_POINTS``."""
+    # Deferred so loading and acting from a saved table never imports torch.
+    import torch
+
+    obs_tensor, _ = model.policy.obs_to_tensor(DECISION_POINT_OBSERVATIONS)
+    with torch.no_grad():
+        # SB3 wraps the mask as a tensor without copying, and torch warns on read-only arrays.
+        distribution = model.policy.get_distribution(
+            obs_tensor, action_masks=DECISION_POINT_MASKS.copy()
+        )
+    return normalize_policy_table(distribution.distribution.probs.cpu().numpy())
+
+
+def save_policy_table(path: Path, probs: np.ndarray) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Through a file handle, so np.save does not append its own ".npy".
+    with path.open("wb") as f:
+        np.save(f, normalize_policy_table(probs))
+    return path
+
+
+def load_policy_table(path: Path) -> np.ndarray:
+    return normalize_policy_table(np.load(Path(path), allow_pickle=False))
+
+
+def checkpoint_digest(path: Path) -> str:
+    """Return the hex sha256 of the file at ``path``."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def table_batch_policy(probs: np.ndarray, deterministic: bool = True) -> BatchPolicy:
+    """Return a ``batch_sim`` policy that acts from ``probs`` (greedy, or sampled)."""
+    probs_by_card_history = np.zeros(
+        (len(CARD_LABELS), len(HISTORY_NODES), ACTION_DIM), dtype=np.float64
+    )
+    for point, point_probs in zip(DECISION_POINTS, normalize_policy_table(probs)):
+        probs_by_card_history[point.private_card, point.history_id] = point_probs
+    greedy_by_card_history = probs_by_card_history.argmax(axis=2)
+    cdf_by_card_history = np.cumsum(probs_by_card_history, axis=2)
+
+    def policy(
+        private_cards: np.ndarray,
+        history_ids: np.ndarray,
+        legal_masks: np.ndarray,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+        del legal_masks
+        if deterministic:
+            return greedy_by_card_history[private_cards, history_ids]
+        cdf = cdf_by_card_history[private_cards, history_ids]
+        # Scaling by the row total keeps draws below it, so zero-probability actions never win.
+        draws = rng.random(len(cdf)) * cdf[:, -1]
+        return np.argmax(cdf > draws[:, None], axis=1)
+
+    return policy
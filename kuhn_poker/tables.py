@@ -0,0 +1,245 @@
+"""Lookup tables that drive the Kuhn hand state machine.
+
+Everything here is derived once from the generated contract at import time and
+is shared, read-only, by the AEC env, the single-agent core env, and the
+batched simulator. A hand is tracked as an index into ``HISTORY_NODES``;
+the other ``*_BY_HISTORY`` tables are indexed the same way.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+from itertools import permutations
+from typing import Final, NamedTuple, Optional
+
+import numpy as np
+
+from kuhn_poker.constants import ACTION_DIM, AGENT_NAMES, CARD_LABELS
+from kuhn_poker.generated.contract import (
+    ACTION_OPEN_LABEL_BY_ID,
+    ACTION_RESPONSE_LABEL_BY_ID,
+    INITIAL_ACTOR,
+    INITIAL_PHASE,
+    LEGAL_MASK_BITS_BY_PHASE,
+    LEGAL_MASK_MATRIX,
+    OBS_ACTOR_OFFSET,
+    OBSERVATION_DIM,
+    OBS_HISTORY_DIM,
+    OBS_HISTORY_INDEX_BY_SEQUENCE,
+    OBS_HISTORY_KEY_SEPARATOR,
+    OBS_HISTORY_OFFSET,
+    OBS_PRIVATE_CARD_OFFSET,
+    OBS_TERMINAL_HISTORY_INDEX,
+    PHASE_INDEX_BY_NAME,
+    PLAYER_INDEX_BY_ID,
+    PUBLIC_ACTIONS,
+    RESPONSE_ACTION_PHASES,
+)
+
+
+# All ordered (player_0, player_1) card pairs; one integer draw picks a deal.
+DEAL_TABLE: tuple[tuple[int, int], ...] = tuple(
+    permutations(range(len(CARD_LABELS)), len(AGENT_NAMES))
+)
+
+
+def _frozen_int8(values: tuple[int, ...]) -> np.ndarray:
+    array = np.array(values, dtype=np.int8)
+    array.setflags(write=False)
+    return array
+
+
+# Shared read-only masks; callers must not mutate what observe()/infos hand out.
+NO_LEGAL_ACTION_MASK = _frozen_int8((0,) * ACTION_DIM)
+
+
+def _build_observation(
+    card_index: Optional[int], history_index: int, actor_index: Optional[int]
+) -> np.ndarray:
+    observation = np.zeros(OBSERVATION_DIM, dtype=np.int8)
+    if card_index is not None:
+        observation[OBS_PRIVATE_CARD_OFFSET + card_index] = 1
+    observation[OBS_HISTORY_OFFSET + history_index] = 1
+    if actor_index is not None:
+        observation[OBS_ACTOR_OFFSET + actor_index] = 1
+    observation.setflags(write=False)
+    return observation
+
+
+# Every reachable observation, keyed by (card_index, history_index, actor_index).
+# `None` marks an unset card (before reset) or no current actor (terminal).
+OBSERVATION_TABLE: dict[tuple[Optional[int], int, Optional[int]], np.ndarray] = {
+    (card_index, history_index, actor_index): _build_observation(
+        card_index, history_index, actor_index
+    )
+    for card_index in (None, *range(len(CARD_LABELS)))
+    for history_index in range(OBS_HISTORY_DIM)
+    for actor_index in (None, *range(len(AGENT_NAMES)))
+}
+
+
+class HandPhase(str, Enum):
+    """Explicit phase machine for one Kuhn hand."""
+
+    DEAL = "deal"
+    P0_ACT = "p0_act"
+    P1_ACT = "p1_act"
+    P0_RESPONSE = "p0_response"
+    P1_RESPONSE = "p1_response"
+    TERMINAL = "terminal"
+
+
+# Every public action sequence reachable in one hand, with the phase it leads to.
+# A history id is an index into this tuple.
+HISTORY_NODES: tuple[tuple[tuple[str, ...], HandPhase], ...] = (
+    ((), HandPhase.P0_ACT),
+    (("check",), HandPhase.P1_ACT),
+    (("bet",), HandPhase.P1_RESPONSE),
+    (("check", "bet"), HandPhase.P0_RESPONSE),
+    (("check", "check"), HandPhase.TERMINAL),
+    (("bet", "call"), HandPhase.TERMINAL),
+    (("bet", "fold"), HandPhase.TERMINAL),
+    (("check", "bet", "call"), HandPhase.TERMINAL),
+    (("check", "bet", "fold"), HandPhase.TERMINAL),
+)
+INITIAL_HISTORY_ID: Final[int] = 0
+# Sentinel history id for an action that is illegal from the current history.
+NO_HISTORY: Final[int] = -1
+
+_HISTORY_ID_BY_SEQUENCE: dict[tuple[str, ...], int] = {
+    sequence: history_id for history_id, (sequence, _) in enumerate(HISTORY_NODES)
+}
+_TOKEN_ID_BY_NAME: dict[str, int] = {token: index for index, token in enumerate(PUBLIC_ACTIONS)}
+
+# _NEXT_HISTORY[history_id][token_id] -> next history id, or NO_HISTORY if unreachable.
+_NEXT_HISTORY: tuple[tuple[int, ...], ...] = tuple(
+    tuple(
+        _HISTORY_ID_BY_SEQUENCE.get(sequence + (token,), NO_HISTORY)
+        for token in PUBLIC_ACTIONS
+    )
+    for sequence, _ in HISTORY_NODES
+)
+# Index of the history one-hot inside the observation vector.
+OBS_HISTORY_INDEX_BY_HISTORY: tuple[int, ...] = tuple(
+    OBS_HISTORY_INDEX_BY_SEQUENCE.get(
+        OBS_HISTORY_KEY_SEPARATOR.join(sequence), OBS_TERMINAL_HISTORY_INDEX
+    )
+    for sequence, _ in HISTORY_NODES
+)
+# Read-only action masks from the contract, one per history.
+LEGAL_MASK_BY_HISTORY: tuple[np.ndarray, ...] = tuple(
+    LEGAL_MASK_MATRIX[PHASE_INDEX_BY_NAME[phase.value]] for _, phase in HISTORY_NODES
+)
+# Bit i set when action id i is legal; what infos expose as "action_mask_bits".
+LEGAL_BITS_BY_HISTORY: tuple[int, ...] = tuple(
+    LEGAL_MASK_BITS_BY_PHASE[phase.value] for _, phase in HISTORY_NODES
+)
+# The phase is a function of the history id; these tables keep enum dispatch off the step path.
+PHASE_NAME_BY_HISTORY: tuple[str, ...] = tuple(phase.value for _, phase in HISTORY_NODES)
+IS_TERMINAL_BY_HISTORY: tuple[bool, ...] = tuple(
+    phase == HandPhase.TERMINAL for _, phase in HISTORY_NODES
+)
+if PHASE_NAME_BY_HISTORY[INITIAL_HISTORY_ID] != INITIAL_PHASE:
+    raise RuntimeError(
+        f"Initial history phase {PHASE_NAME_BY_HISTORY[INITIAL_HISTORY_ID]!r} "
+        f"does not match contract initial phase {INITIAL_PHASE!r}."
+    )
+
+# How a transition settles the pot: not at all, by card strength, or to the last bettor.
+WINNER_NONE: Final[int] = 0
+WINNER_SHOWDOWN: Final[int] = 1
+WINNER_LAST_BETTOR: Final[int] = 2
+
+
+class Transition(NamedTuple):
+    """Effect of one legal action taken from a given history."""
+
+    next_history_id: int
+    contribution: int
+    sets_last_bettor: bool
+    winner_rule: int
+
+
+def _build_transitions() -> tuple[tuple[Optional[Transition], ...], ...]:
+    table = []
+    for history_id, (_, phase) in enumerate(HISTORY_NODES):
+        labels = (
+            ACTION_RESPONSE_LABEL_BY_ID
+            if phase.value in RESPONSE_ACTION_PHASES
+            else ACTION_OPEN_LABEL_BY_ID
+        )
+        row: list[Optional[Transition]] = []
+        for action in range(ACTION_DIM):
+            if LEGAL_MASK_BY_HISTORY[history_id][action] == 0:
+                row.append(None)
+                continue
+            token = labels[action]
+            next_history_id = _NEXT_HISTORY[history_id][_TOKEN_ID_BY_NAME[token]]
+            if next_history_id == NO_HISTORY:
+                raise RuntimeError(f"Invalid transition. phase={phase.value}, token={token}")
+            if HISTORY_NODES[next_history_id][1] != HandPhase.TERMINAL:
+                winner_rule = WINNER_NONE
+            elif token == "fold":
+                winner_rule = WINNER_LAST_BETTOR
+            else:
+                winner_rule = WINNER_SHOWDOWN
+            row.append(
+                Transition(
+                    next_history_id=next_history_id,
+                    contribution=1 if token in ("bet", "call") else 0,
+                    sets_last_bettor=token == "bet",
+                    winner_rule=winner_rule,
+                )
+            )
+        table.append(tuple(row))
+    return tuple(table)
+
+
+# TRANSITIONS[history_id][action] -> Transition, or None when the action is illegal.
+# Kept as plain tuples on purpose: a JIT-compiled step kernel (e.g. Numba) costs more
+# per call to dispatch than these lookups take, so it would slow single-env steps.
+TRANSITIONS = _build_transitions()
+
+# Chips (player_0, player_1) post before the first action.
+ANTE_CONTRIBUTIONS: Final[tuple[int, int]] = (1, 1)
+
+
+def _build_terminal_rewards() -> dict[tuple[int, bool], tuple[float, float]]:
+    rewards: dict[tuple[int, bool], tuple[float, float]] = {}
+    # (history_id, actor_id, contributions, last_bettor_id) for each live node to expand.
+    pending: list[tuple[int, int, tuple[int, int], Optional[int]]] = [
+        (INITIAL_HISTORY_ID, PLAYER_INDEX_BY_ID[INITIAL_ACTOR], ANTE_CONTRIBUTIONS, None)
+    ]
+    while pending:
+        history_id, actor_id, contributions, last_bettor_id = pending.pop()
+        for transition in TRANSITIONS[history_id]:
+            if transition is None:
+                continue
+            next_contributions = list(contributions)
+            next_contributions[actor_id] += transition.contribution
+            next_bettor_id = actor_id if transition.sets_last_bettor else last_bettor_id
+            if transition.winner_rule == WINNER_NONE:
+                pending.append(
+                    (
+                        transition.next_history_id,
+                        1 - actor_id,
+                        (next_contributions[0], next_contributions[1]),
+                        next_bettor_id,
+                    )
+                )
+                continue
+
+            pot = next_contributions[0] + next_contributions[1]
+            for p0_wins_showdown in (False, True):
+                if transition.winner_rule == WINNER_SHOWDOWN:
+                    winner_id = 0 if p0_wins_showdown else 1
+                else:
+                    winner_id = next_bettor_id
+                payoff = [float(-chips) for chips in next_contributions]
+                payoff[winner_id] += pot
+                rewards[(transition.next_history_id, p0_wins_showdown)] = (payoff[0], payoff[1])
+    return rewards
+
+
+# TERMINAL_REWARDS[(terminal_history_id, p0_has_higher_card)] -> (p0_reward, p1_reward).
+TERMINAL_REWARDS = _build_terminal_rewards()
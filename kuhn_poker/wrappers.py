@@ -6,9 +6,22 @@ from typing import Optional
 
 import gymnasium as gym
 import numpy as np
-from sb3_contrib.common.wrappers import ActionMasker
 
-from kuhn_poker.env import KuhnPokerAECEnv
+from kuhn_poker.env import ACTION_SPACE, OBSERVATION_SPACE, KuhnPokerAECEnv
+from kuhn_poker.generated.contract import INITIAL_ACTOR, PLAYER_INDEX_BY_ID
+from kuhn_poker.tables import (
+    DEAL_TABLE,
+    INITIAL_HISTORY_ID,
+    LEGAL_BITS_BY_HISTORY,
+    LEGAL_MASK_BY_HISTORY,
+    NO_LEGAL_ACTION_MASK,
+    OBS_HISTORY_INDEX_BY_HISTORY,
+    OBSERVATION_TABLE,
+    PHASE_NAME_BY_HISTORY,
+    TERMINAL_REWARDS,
+    TRANSITIONS,
+    WINNER_NONE,
+)
 
 try:
     from pettingzoo.utils import BaseWrapper
@@ -49,11 +62,91 @@ class SB3ActionMaskWrapper(BaseWrapper, gym.Env):
             dict(self.infos[current_agent]),
         )
 
+    # The env already hands out int8 arrays (shared and read-only), so pass them through.
     def observe(self, agent: str) -> np.ndarray:
-        return np.asarray(super().observe(agent)["observation"], dtype=np.int8)
+        return super().observe(agent)["observation"]
 
     def action_mask(self) -> np.ndarray:
-        return np.asarray(super().observe(self.agent_selection)["action_mask"], dtype=np.int8)
+        return super().observe(self.agent_selection)["action_mask"]
+
+
+class KuhnCoreEnv(gym.Env):
+    """Shared-policy self-play Kuhn env stepped directly on the integer state tables.
+
+    Matches ``SB3ActionMaskWrapper(KuhnPokerAECEnv())`` step for step, but skips the
+    AEC bookkeeping. Each step acts for the current player and reports that player's
+    reward; the returned observation is for the player who acts next.
+    """
+
+    metadata = {"render_modes": []}
+
+    def __init__(self) -> None:
+        self.observation_space = OBSERVATION_SPACE["observation"]
+        self.action_space = ACTION_SPACE
+        self._cards: tuple[int, int] = DEAL_TABLE[0]
+        self._history_id = INITIAL_HISTORY_ID
+        self._actor_id = PLAYER_INDEX_BY_ID[INITIAL_ACTOR]
+        self._terminal = True
+
+    def reset(
+        self, seed: Optional[int] = None, options: Optional[dict] = None
+    ) -> tuple[np.ndarray, dict]:
+        super().reset(seed=seed, options=options)
+        self._cards = DEAL_TABLE[int(self.np_random.integers(len(DEAL_TABLE)))]
+        self._history_id = INITIAL_HISTORY_ID
+        self._actor_id = PLAYER_INDEX_BY_ID[INITIAL_ACTOR]
+        self._terminal = False
+        return self._observation(), {
+            "action_mask": self.action_masks(),
+            "action_mask_bits": LEGAL_BITS_BY_HISTORY[self._history_id],
+            "phase": PHASE_NAME_BY_HISTORY[self._history_id],
+        }
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool, bool, dict]:
+        action = int(action)
+        transition = (
+            None
+            if self._terminal or not 0 <= action < len(TRANSITIONS[self._history_id])
+            else TRANSITIONS[self._history_id][action]
+        )
+        if transition is None:
+            raise ValueError(
+                f"Illegal action {action}. Legal mask: {self.action_masks().tolist()}"
+            )
+
+        actor_id = self._actor_id
+        self._history_id = transition.next_history_id
+        self._actor_id = 1 - actor_id
+        reward = 0.0
+        if transition.winner_rule != WINNER_NONE:
+            self._terminal = True
+            reward = TERMINAL_REWARDS[(self._history_id, self._cards[0] > self._cards[1])][
+                actor_id
+            ]
+        return (
+            self._observation(),
+            reward,
+            self._terminal,
+            False,
+            {
+                "action_mask": NO_LEGAL_ACTION_MASK,
+                "action_mask_bits": 0,
+                "phase": PHASE_NAME_BY_HISTORY[self._history_id],
+            },
+        )
+
+    def action_masks(self) -> np.ndarray:
+        if self._terminal:
+            return NO_LEGAL_ACTION_MASK
+        return LEGAL_MASK_BY_HISTORY[self._history_id]
+
+    def _observation(self) -> np.ndarray:
+        key = (
+            self._cards[self._actor_id],
+            OBS_HISTORY_INDEX_BY_HISTORY[self._history_id],
+            None if self._terminal else self._actor_id,
+        )
+        return OBSERVATION_TABLE[key]
 
 
 def mask_fn(env: SB3ActionMaskWrapper) -> np.ndarray:
@@ -61,9 +154,12 @@ def mask_fn(env: SB3ActionMaskWrapper) -> np.ndarray:
     return env.action_mask()
 
 
-def make_masked_sb3_env(seed: int = 0):
-    """Create the minimal SB3-compatible masked training environment."""
-    env = KuhnPokerAECEnv()
-    env = SB3ActionMaskWrapper(env)
+def make_masked_sb3_env(seed: int = 0) -> KuhnCoreEnv:
+    """Create the minimal SB3-compatible masked training environment.
+
+    ``KuhnCoreEnv`` exposes ``action_masks()`` itself, so MaskablePPO needs no
+    ``ActionMasker`` wrapper.
+    """
+    env = KuhnCoreEnv()
     env.reset(seed=seed)
-    return ActionMasker(env, mask_fn)
+    return env
@@ -12,25 +12,45 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from kuhn_poker.constants import AGENT_NAMES
+from kuhn_poker.batch_sim import heuristic_policy, random_legal_policy, run_hands_batch
+from kuhn_poker.constants import AGENT_INDEX, AGENT_NAMES
 from kuhn_poker.env import KuhnPokerAECEnv
 from kuhn_poker.opponents import sample_random_legal_action, simple_heuristic_action
+from kuhn_poker.policy_table import load_policy_table, table_batch_policy
+
+BASELINE_POLICIES = {"random-legal": random_legal_policy, "heuristic": heuristic_policy}
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Baseline Kuhn Poker evaluation scaffold.")
     parser.add_argument("--hands", type=int, default=200)
     parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--per-hand",
+        action="store_true",
+        help="Step every hand through the AEC env instead of the batched NumPy rollout.",
+    )
+    parser.add_argument(
+        "--policy-table",
+        type=Path,
+        default=None,
+        help=(
+            "Evaluate a trained bot from the .policy.npy table saved by scripts/train.py "
+            "against each baseline, from both seats (NumPy only, no torch/SB3)."
+        ),
+    )
     return parser.parse_args()
 
 
-def play_hand(env: KuhnPokerAECEnv, rng: np.random.Generator) -> dict[str, float]:
-    returns = {agent: 0.0 for agent in AGENT_NAMES}
-    env.reset()
+def play_hand(env: KuhnPokerAECEnv, rng: np.random.Generator) -> np.ndarray:
+    """Heuristic (seat 0) vs random-legal (seat 1) for one hand; returns are indexed by seat."""
+    returns = np.zeros(len(AGENT_NAMES))
+    env.quick_reset()
 
-    for agent in env.agent_iter(max_iter=10):
+    while env.agents:
+        agent = env.agent_selection
         obs, reward, termination, truncation, _ = env.last()
-        returns[agent] += reward
+        returns[AGENT_INDEX[agent]] += reward
 
         if termination or truncation:
             action = None
@@ -48,26 +68,52 @@ def play_hand(env: KuhnPokerAECEnv, rng: np.random.Generator) -> dict[str, float
     return returns
 
 
+def play_hands_vectorized(num_hands: int, rng: np.random.Generator) -> np.ndarray:
+    """Play heuristic (seat 0) vs random-legal (seat 1) over a batch; rewards are [n, 2]."""
+    return run_hands_batch(num_hands, rng, policies=(heuristic_policy, random_legal_policy))
+
+
+def evaluate_policy_table(
+    table_path: Path, num_hands: int, rng: np.random.Generator
+) -> dict[str, np.ndarray]:
+    """Bot average return per seat against each baseline, keyed by baseline name."""
+    bot_policy = table_batch_policy(load_policy_table(table_path))
+    results = {}
+    for name, baseline in BASELINE_POLICIES.items():
+        as_p0 = run_hands_batch(num_hands, rng, policies=(bot_policy, baseline))[:, 0].mean()
+        as_p1 = run_hands_batch(num_hands, rng, policies=(baseline, bot_policy))[:, 1].mean()
+        results[name] = np.array([as_p0, as_p1])
+    return results
+
+
 def main() -> None:
     args = parse_args()
     rng = np.random.default_rng(args.seed)
-    env = KuhnPokerAECEnv()
 
-    aggregate = {agent: 0.0 for agent in AGENT_NAMES}
-    for _ in range(args.hands):
-        result = play_hand(env, rng)
-        for agent in AGENT_NAMES:
-            aggregate[agent] += result[agent]
+    if args.policy_table is not None:
+        if args.per_hand:
+            raise SystemExit("--policy-table runs batched only; drop --per-hand.")
+        print(f"Hands per seat and baseline: {args.hands}")
+        results = evaluate_policy_table(args.policy_table, args.hands, rng)
+        for name, seat_returns in results.items():
+            print(
+                f"bot vs {name}: {seat_returns[0]:+.3f} as {AGENT_NAMES[0]}, "
+                f"{seat_returns[1]:+.3f} as {AGENT_NAMES[1]}, "
+                f"{seat_returns.mean():+.3f} overall"
+            )
+        return
+
+    if args.per_hand:
+        env = KuhnPokerAECEnv()
+        totals = np.zeros(len(AGENT_NAMES))
+        for _ in range(args.hands):
+            totals += play_hand(env, rng)
+    else:
+        totals = play_hands_vectorized(args.hands, rng).sum(axis=0)
 
     print(f"Hands: {args.hands}")
-    print(
-        f"{AGENT_NAMES[0]} average return (heuristic): "
-        f"{aggregate[AGENT_NAMES[0]] / args.hands:.3f}"
-    )
-    print(
-        f"{AGENT_NAMES[1]} average return (random-legal): "
-        f"{aggregate[AGENT_NAMES[1]] / args.hands:.3f}"
-    )
+    print(f"{AGENT_NAMES[0]} average return (heuristic): {totals[0] / args.hands:.3f}")
+    print(f"{AGENT_NAMES[1]} average return (random-legal): {totals[1] / args.hands:.3f}")
 
 
 if __name__ == "__main__":
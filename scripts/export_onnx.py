@@ -3,17 +3,14 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import sys
 from pathlib import Path
 
-from sb3_contrib import MaskablePPO
-
 REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from kuhn_poker.onnx_export import DEFAULT_ONNX_OPSET, export_maskable_ppo_to_onnx
-
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Export MaskablePPO checkpoint to ONNX.")
@@ -32,8 +29,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--opset",
         type=int,
-        default=DEFAULT_ONNX_OPSET,
-        help="ONNX opset version.",
+        default=None,
+        help="ONNX opset version (default: DEFAULT_ONNX_OPSET from kuhn_poker.onnx_export).",
     )
     return parser.parse_args()
 
@@ -51,11 +48,17 @@ def resolve_checkpoint_path(checkpoint_path: Path) -> Path:
 def main() -> None:
     args = parse_args()
     checkpoint_path = resolve_checkpoint_path(args.checkpoint_path)
+
+    # Deferred so --help and argument errors do not pay for importing torch/SB3.
+    from sb3_contrib import MaskablePPO
+
+    from kuhn_poker.onnx_export import DEFAULT_ONNX_OPSET, export_maskable_ppo_to_onnx
+
     model = MaskablePPO.load(checkpoint_path, device="cpu")
     onnx_path = export_maskable_ppo_to_onnx(
         model=model,
         onnx_path=args.onnx_out,
-        opset_version=args.opset,
+        opset_version=DEFAULT_ONNX_OPSET if args.opset is None else args.opset,
     )
 
     print(f"Exported ONNX model: {onnx_path}")
@@ -66,8 +69,16 @@ def main() -> None:
         print("Optional validation skipped (install with: pip install -e .[onnx]).")
         return
 
-    onnx_model = onnx.load(str(onnx_path))
-    onnx.checker.check_model(onnx_model)
+    # Re-exporting an unchanged policy yields identical bytes; skip re-checking those.
+    digest = hashlib.sha256(onnx_path.read_bytes()).hexdigest()
+    validated_path = onnx_path.with_suffix(".onnx.validated")
+    if validated_path.exists() and validated_path.read_text(encoding="utf-8").strip() == digest:
+        print("ONNX validation passed (cached).")
+        return
+
+    # Given a path, the C++ checker reads the file itself; no Python ModelProto is built.
+    onnx.checker.check_model(str(onnx_path), full_check=True)
+    validated_path.write_text(f"{digest}\n", encoding="utf-8")
     print("ONNX validation passed.")
 
 
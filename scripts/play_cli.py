@@ -3,19 +3,87 @@
 from __future__ import annotations
 
 import argparse
+import codecs
+import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Final, Optional
 
 import numpy as np
-from sb3_contrib import MaskablePPO
+
+try:
+    import termios
+    import tty
+except ImportError:  # pragma: no cover - no termios on Windows
+    termios = None  # type: ignore[assignment]
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from kuhn_poker.constants import AGENT_NAMES, CARD_LABELS, Action
-from kuhn_poker.env import HandPhase, KuhnPokerAECEnv
+from kuhn_poker.batch_sim import (
+    BatchPolicy,
+    heuristic_policy,
+    random_legal_policy,
+    run_hands_batch,
+)
+from kuhn_poker.constants import ACTION_DIM, AGENT_INDEX, AGENT_NAMES, CARD_LABELS, Action
+from kuhn_poker.env import DECISION_POINTS, HandPhase, KuhnPokerAECEnv
+from kuhn_poker.generated.contract import ONNX_INPUT_ACTION_MASK_NAME, ONNX_INPUT_OBSERVATION_NAME
+from kuhn_poker.policy_table import (
+    DECISION_POINT_MASKS,
+    DECISION_POINT_OBSERVATIONS,
+    EXPORTS_DIGEST_SUFFIX,
+    POLICY_TABLE_SUFFIX,
+    checkpoint_digest,
+    decision_point_probabilities,
+    load_policy_table,
+    normalize_policy_table,
+    table_batch_policy,
+)
+
+_CHECK_OR_CALL: Final[int] = int(Action.CHECK_OR_CALL)
+_BET: Final[int] = int(Action.BET)
+_FOLD: Final[int] = int(Action.FOLD)
+
+_RESPONSE_PHASES: Final[frozenset[HandPhase]] = frozenset(
+    (HandPhase.P0_RESPONSE, HandPhase.P1_RESPONSE)
+)
+# _ACTION_LABELS[facing_bet][action_id]; check/call is the only context-dependent label.
+_ACTION_LABELS: Final[tuple[tuple[str, ...], ...]] = tuple(
+    tuple(
+        {_CHECK_OR_CALL: "call" if facing_bet else "check", _BET: "bet", _FOLD: "fold"}[action]
+        for action in range(ACTION_DIM)
+    )
+    for facing_bet in (False, True)
+)
+
+# Keys the human types for each action, in prompt order.
+_COMMAND_ACTIONS: Final[dict[str, int]] = {"c": _CHECK_OR_CALL, "b": _BET, "f": _FOLD}
+
+
+def _build_legal_action_prompt(legal_bits: int, facing_bet: bool) -> str:
+    options = [
+        f"[{command}] {_ACTION_LABELS[facing_bet][action]}"
+        for command, action in _COMMAND_ACTIONS.items()
+        if legal_bits >> action & 1
+    ]
+    options.append("[h] help")
+    options.append("[q] quit")
+    return ", ".join(options)
+
+
+# _LEGAL_ACTION_PROMPTS[(facing_bet << ACTION_DIM) | legal_bits]: every prompt, built once.
+_LEGAL_ACTION_PROMPTS: Final[tuple[str, ...]] = tuple(
+    _build_legal_action_prompt(legal_bits, facing_bet)
+    for facing_bet in (False, True)
+    for legal_bits in range(1 << ACTION_DIM)
+)
+
+AUTOPLAY_OPPONENTS: dict[str, BatchPolicy] = {
+    "random": random_legal_policy,
+    "heuristic": heuristic_policy,
+}
 
 
 def parse_args() -> argparse.Namespace:
@@ -24,7 +92,12 @@ def parse_args() -> argparse.Namespace:
         "--model-path",
         type=Path,
         default=Path("checkpoints/maskable_ppo_kuhn.zip"),
-        help="Path to .zip checkpoint from scripts/train.py",
+        help=(
+            "Path to a .zip checkpoint from scripts/train.py, or a saved .policy.npy "
+            "table or exported .pt/.onnx policy. The .policy.npy/.pt exports train.py "
+            "writes next to the .zip are loaded instead (table first) while the .zip "
+            "still matches the sha256 in <ckpt>.exports.sha256; pass a .onnx explicitly."
+        ),
     )
     parser.add_argument("--seed", type=int, default=7)
     parser.add_argument(
@@ -45,22 +118,132 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Use stochastic policy sampling instead of deterministic actions.",
     )
+    parser.add_argument(
+        "--autoplay",
+        choices=sorted(AUTOPLAY_OPPONENTS),
+        default=None,
+        help=(
+            "Seat a scripted opponent in the human seat and play --hands hands as one "
+            "batched rollout, printing only the session score."
+        ),
+    )
     return parser.parse_args()
 
 
-def resolve_model_path(model_path: Path) -> Path:
-    if model_path.exists():
-        return model_path
-    if model_path.suffix != ".zip":
-        zipped = model_path.with_suffix(".zip")
-        if zipped.exists():
-            return zipped
+def resolve_model_path(model_path: Path) -> tuple[Path, Optional[Path]]:
+    """Return the artifact to load and, for a train.py export, the checkpoint it came from.
+
+    The exports train.py writes next to a .zip skip loading SB3; they are used only
+    while the checkpoint still has the sha256 recorded alongside them.
+    """
+    checkpoint = model_path if model_path.exists() else model_path.with_suffix(".zip")
+    if checkpoint.exists() and checkpoint.suffix == ".zip":
+        exports = [
+            export
+            for export in (
+                checkpoint.with_suffix(POLICY_TABLE_SUFFIX),
+                checkpoint.with_suffix(".pt"),
+            )
+            if export.exists()
+        ]
+        if exports:
+            digest_path = checkpoint.with_suffix(EXPORTS_DIGEST_SUFFIX)
+            recorded = digest_path.read_text().strip() if digest_path.exists() else None
+            if recorded == checkpoint_digest(checkpoint):
+                return exports[0], checkpoint
+            print(
+                f"Warning: {exports[0].name} was not exported from the current "
+                f"{checkpoint.name}; loading the checkpoint instead.",
+                file=sys.stderr,
+            )
+    if checkpoint.exists():
+        return checkpoint, None
     raise FileNotFoundError(
         f"Model checkpoint not found: {model_path}. "
         "Train first with scripts/train.py or pass --model-path."
     )
 
 
+class BotPolicyTable:
+    """The bot's action distribution at every decision point, from one batched forward pass.
+
+    Kuhn has only a dozen decision points, so the CLI never runs the network during play.
+    ``probs[i]`` is the bot's action distribution at ``DECISION_POINTS[i]``.
+    """
+
+    def __init__(self, probs: np.ndarray) -> None:
+        probs = normalize_policy_table(probs)
+        self._table = probs
+
+        # An observation encodes card, history and actor, so its bytes identify the point.
+        keys = [point.observation.tobytes() for point in DECISION_POINTS]
+        self._probs = dict(zip(keys, probs))
+        self._greedy_actions = dict(zip(keys, probs.argmax(axis=1).tolist()))
+
+    def act(
+        self, observation: np.ndarray, deterministic: bool, rng: np.random.Generator
+    ) -> int:
+        key = observation.tobytes()
+        if deterministic:
+            return self._greedy_actions[key]
+        return int(rng.choice(ACTION_DIM, p=self._probs[key]))
+
+    @classmethod
+    def load(cls, model_path: Path) -> BotPolicyTable:
+        """Build the table from a .zip checkpoint, a saved table, a traced .pt or an .onnx."""
+        if model_path.name.endswith(POLICY_TABLE_SUFFIX):
+            return cls(load_policy_table(model_path))
+        if model_path.suffix == ".onnx":
+            return cls.from_onnx(model_path)
+        if model_path.suffix == ".pt":
+            return cls.from_traced(model_path)
+        return cls.from_checkpoint(model_path)
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint_path: Path) -> BotPolicyTable:
+        # Deferred so the exported-model paths never import SB3.
+        from sb3_contrib import MaskablePPO
+
+        return cls(decision_point_probabilities(MaskablePPO.load(checkpoint_path, device="cpu")))
+
+    @classmethod
+    def from_onnx(cls, onnx_path: Path) -> BotPolicyTable:
+        try:
+            import onnxruntime
+        except ImportError as exc:
+            raise SystemExit(
+                "Playing an .onnx model needs onnxruntime (install with: pip install -e .[onnx])."
+            ) from exc
+
+        session = onnxruntime.InferenceSession(
+            str(onnx_path), providers=["CPUExecutionProvider"]
+        )
+        masked_logits, _ = session.run(
+            None,
+            {
+                ONNX_INPUT_OBSERVATION_NAME: DECISION_POINT_OBSERVATIONS.astype(np.float32),
+                ONNX_INPUT_ACTION_MASK_NAME: DECISION_POINT_MASKS.astype(np.float32),
+            },
+        )
+        return cls(np.exp(masked_logits - masked_logits.max(axis=1, keepdims=True)))
+
+    @classmethod
+    def from_traced(cls, traced_path: Path) -> BotPolicyTable:
+        import torch
+
+        module = torch.jit.load(str(traced_path), map_location="cpu")
+        with torch.no_grad():
+            masked_logits, _ = module(
+                torch.from_numpy(DECISION_POINT_OBSERVATIONS.astype(np.float32)),
+                torch.from_numpy(DECISION_POINT_MASKS.astype(np.float32)),
+            )
+        return cls(torch.softmax(masked_logits, dim=1).numpy())
+
+    def batch_policy(self, deterministic: bool) -> BatchPolicy:
+        """Return a ``batch_sim`` policy that looks up every live hand's action at once."""
+        return table_batch_policy(self._table, deterministic)
+
+
 def format_history(history: list[str]) -> str:
     return " ".join(history) if history else "(start)"
 
@@ -69,29 +252,39 @@ def card_label(card_idx: int) -> str:
     return CARD_LABELS[card_idx]
 
 
-def is_response_phase(phase: HandPhase) -> bool:
-    return phase in (HandPhase.P0_RESPONSE, HandPhase.P1_RESPONSE)
-
-
 def action_label(action: int, phase: HandPhase) -> str:
-    if action == int(Action.CHECK_OR_CALL):
-        return "call" if is_response_phase(phase) else "check"
-    if action == int(Action.BET):
-        return "bet"
-    return "fold"
-
-
-def legal_action_prompt(mask: np.ndarray, phase: HandPhase) -> str:
-    options: list[str] = []
-    if mask[int(Action.CHECK_OR_CALL)] == 1:
-        options.append(f"[c] {action_label(int(Action.CHECK_OR_CALL), phase)}")
-    if mask[int(Action.BET)] == 1:
-        options.append("[b] bet")
-    if mask[int(Action.FOLD)] == 1:
-        options.append("[f] fold")
-    options.append("[h] help")
-    options.append("[q] quit")
-    return ", ".join(options)
+    return _ACTION_LABELS[phase in _RESPONSE_PHASES][action]
+
+
+def legal_action_prompt(legal_bits: int, phase: HandPhase) -> str:
+    """Prompt line for the legal actions, given packed mask bits (bit i = action id i)."""
+    return _LEGAL_ACTION_PROMPTS[((phase in _RESPONSE_PHASES) << ACTION_DIM) | legal_bits]
+
+
+def read_command(prompt: str) -> str:
+    """Read one command; on a terminal a single keypress is enough, no Enter needed."""
+    if termios is None or not sys.stdin.isatty():
+        return input(prompt).strip().lower()
+
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    fd = sys.stdin.fileno()
+    saved_attributes = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd)
+        # Read the key's whole UTF-8 sequence, so a non-ASCII key is an unknown command
+        # rather than an empty string that reads as Enter.
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        char = ""
+        while not char:
+            data = os.read(fd, 1)
+            if not data:
+                raise EOFError
+            char = decoder.decode(data)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved_attributes)
+    sys.stdout.write(f"{char}\n" if char.isprintable() else "\n")
+    return char.strip().lower()
 
 
 def print_help() -> None:
@@ -103,59 +296,53 @@ def print_help() -> None:
     print("  q -> quit")
 
 
-def prompt_human_action(mask: np.ndarray, phase: HandPhase) -> Optional[int]:
+def prompt_human_action(legal_bits: int, phase: HandPhase) -> Optional[int]:
     while True:
-        print(f"Legal actions: {legal_action_prompt(mask, phase)}")
-        raw = input("Your action: ").strip().lower()
+        print(f"Legal actions: {legal_action_prompt(legal_bits, phase)}")
+        raw = read_command("Your action: ")
 
         if raw == "h":
             print_help()
             continue
         if raw == "q":
             return None
-        if raw == "c" and mask[int(Action.CHECK_OR_CALL)] == 1:
-            return int(Action.CHECK_OR_CALL)
-        if raw == "b" and mask[int(Action.BET)] == 1:
-            return int(Action.BET)
-        if raw == "f" and mask[int(Action.FOLD)] == 1:
-            return int(Action.FOLD)
+        action = _COMMAND_ACTIONS.get(raw)
+        if action is not None and legal_bits >> action & 1:
+            return action
         print("Invalid or illegal action for this state. Try again.")
 
 
 def play_hand(
     env: KuhnPokerAECEnv,
-    model: MaskablePPO,
+    policy: BotPolicyTable,
     deterministic_bot: bool,
+    rng: np.random.Generator,
     human_agent: str,
     bot_agent: str,
-) -> tuple[bool, dict[str, float]]:
-    returns = {agent: 0.0 for agent in AGENT_NAMES}
+) -> tuple[bool, np.ndarray]:
+    returns = np.zeros(len(AGENT_NAMES))
     env.reset()
 
     print("")
     print(f"Your card: {card_label(env.private_cards[human_agent])}")
 
-    for agent in env.agent_iter(max_iter=10):
-        obs, reward, termination, truncation, _ = env.last()
-        returns[agent] += reward
+    while env.agents:
+        agent = env.agent_selection
+        obs, reward, termination, truncation, info = env.last()
+        returns[AGENT_INDEX[agent]] += reward
 
         if termination or truncation:
             action = None
         elif agent == human_agent:
             phase = env.phase
             print(f"History: {format_history(env.history)}")
-            action = prompt_human_action(obs["action_mask"], phase)
+            action = prompt_human_action(info["action_mask_bits"], phase)
             if action is None:
                 return True, returns
             print(f"You chose: {action_label(action, phase)}")
         else:
             phase = env.phase
-            action, _ = model.predict(
-                obs["observation"],
-                action_masks=obs["action_mask"],
-                deterministic=deterministic_bot,
-            )
-            action = int(action)
+            action = policy.act(obs["observation"], deterministic_bot, rng)
             print(f"Bot chose: {action_label(action, phase)}")
 
         env.step(action)
@@ -167,15 +354,15 @@ def play_hand(
     )
     print(f"Final history: {format_history(env.history)}")
     print(
-        f"Hand return: you={returns[human_agent]:+.1f}, "
-        f"bot={returns[bot_agent]:+.1f}"
+        f"Hand return: you={returns[AGENT_INDEX[human_agent]]:+.1f}, "
+        f"bot={returns[AGENT_INDEX[bot_agent]]:+.1f}"
     )
     return False, returns
 
 
 def prompt_continue() -> bool:
     while True:
-        raw = input("Press Enter or [n] for next hand, [q] to quit: ").strip().lower()
+        raw = read_command("Press Enter or [n] for next hand, [q] to quit: ")
         if raw in ("", "n"):
             return True
         if raw == "q":
@@ -183,22 +370,58 @@ def prompt_continue() -> bool:
         print("Invalid command. Use Enter, n, or q.")
 
 
+def autoplay(
+    policy: BotPolicyTable,
+    opponent: str,
+    num_hands: int,
+    deterministic_bot: bool,
+    rng: np.random.Generator,
+    bot_seat: int,
+) -> np.ndarray:
+    """Play the bot against a scripted opponent over ``num_hands`` hands; rewards are [n, 2]."""
+    policies = [AUTOPLAY_OPPONENTS[opponent]] * len(AGENT_NAMES)
+    policies[bot_seat] = policy.batch_policy(deterministic_bot)
+    return run_hands_batch(num_hands, rng, policies=policies)
+
+
 def main() -> None:
     args = parse_args()
-    model_path = resolve_model_path(args.model_path)
+    if args.autoplay is not None and args.hands <= 0:
+        raise SystemExit("--autoplay needs a positive --hands count.")
+    model_path, exported_from = resolve_model_path(args.model_path)
+    loaded = f"{model_path} (exported from {exported_from})" if exported_from else str(model_path)
     human_agent = AGENT_NAMES[args.human_seat]
     bot_agent = AGENT_NAMES[1 - args.human_seat]
 
-    model = MaskablePPO.load(model_path)
+    policy = BotPolicyTable.load(model_path)
+    rng = np.random.default_rng(args.seed)
+
+    if args.autoplay is not None:
+        totals = autoplay(
+            policy=policy,
+            opponent=args.autoplay,
+            num_hands=args.hands,
+            deterministic_bot=not args.stochastic_bot,
+            rng=rng,
+            bot_seat=1 - args.human_seat,
+        ).sum(axis=0)
+        print(f"Loaded model: {loaded}")
+        print(
+            f"Final score after {args.hands} hand(s): "
+            f"{args.autoplay}={totals[args.human_seat]:+.1f}, "
+            f"bot={totals[1 - args.human_seat]:+.1f}"
+        )
+        return
+
     env = KuhnPokerAECEnv()
     env.reset(seed=args.seed)
 
     print("Kuhn Poker CLI")
     print(f"You are {human_agent}. Bot is {bot_agent}.")
-    print(f"Loaded model: {model_path}")
+    print(f"Loaded model: {loaded}")
     print_help()
 
-    totals = {agent: 0.0 for agent in AGENT_NAMES}
+    totals = np.zeros(len(AGENT_NAMES))
     hand_count = 0
     completed_hands = 0
     quit_requested = False
@@ -212,19 +435,19 @@ def main() -> None:
         print(f"=== Hand {hand_count} ===")
         quit_requested, hand_returns = play_hand(
             env=env,
-            model=model,
+            policy=policy,
             deterministic_bot=not args.stochastic_bot,
+            rng=rng,
             human_agent=human_agent,
             bot_agent=bot_agent,
         )
 
         if not quit_requested:
             completed_hands += 1
-            for agent in AGENT_NAMES:
-                totals[agent] += hand_returns[agent]
+            totals += hand_returns
             print(
-                f"Session score: you={totals[human_agent]:+.1f}, "
-                f"bot={totals[bot_agent]:+.1f}"
+                f"Session score: you={totals[args.human_seat]:+.1f}, "
+                f"bot={totals[1 - args.human_seat]:+.1f}"
             )
             if args.hands == 0:
                 quit_requested = not prompt_continue()
@@ -234,8 +457,8 @@ def main() -> None:
         print("")
         print(
             f"Final score after {completed_hands} completed hand(s): "
-            f"you={totals[human_agent]:+.1f}, "
-            f"bot={totals[bot_agent]:+.1f}"
+            f"you={totals[args.human_seat]:+.1f}, "
+            f"bot={totals[1 - args.human_seat]:+.1f}"
         )
     print("Session ended.")
 
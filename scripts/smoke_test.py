@@ -12,7 +12,8 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from kuhn_poker.constants import AGENT_NAMES
+from kuhn_poker.batch_sim import run_hands_batch
+from kuhn_poker.constants import AGENT_INDEX, AGENT_NAMES
 from kuhn_poker.env import KuhnPokerAECEnv
 from kuhn_poker.opponents import sample_random_legal_action
 
@@ -21,45 +22,60 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run environment smoke test.")
     parser.add_argument("--hands", type=int, default=100)
     parser.add_argument("--seed", type=int, default=123)
+    parser.add_argument(
+        "--per-hand",
+        action="store_true",
+        help="Step every hand through the AEC env instead of the batched NumPy rollout.",
+    )
     return parser.parse_args()
 
 
-def run_hand(env: KuhnPokerAECEnv, rng: np.random.Generator) -> dict[str, float]:
-    returns = {agent: 0.0 for agent in AGENT_NAMES}
-    env.reset()
+def run_hand(env: KuhnPokerAECEnv, rng: np.random.Generator) -> np.ndarray:
+    """Random-legal self-play for one hand; returns are indexed by seat."""
+    returns = np.zeros(len(AGENT_NAMES))
+    env.quick_reset()
 
-    for agent in env.agent_iter(max_iter=10):
-        obs, reward, termination, truncation, _ = env.last()
-        returns[agent] += reward
+    while env.agents:
+        agent = env.agent_selection
+        obs, reward, termination, truncation, info = env.last()
+        returns[AGENT_INDEX[agent]] += reward
         if termination or truncation:
             action = None
         else:
-            if int(np.sum(obs["action_mask"])) < 1:
+            if info["action_mask_bits"].bit_count() < 1:
                 raise RuntimeError(f"No legal action for live agent {agent}.")
             action = sample_random_legal_action(obs["action_mask"], rng=rng)
         env.step(action)
 
-    total = sum(returns.values())
-    if not np.isclose(total, 0.0):
+    if not np.isclose(returns.sum(), 0.0):
         raise RuntimeError(f"Non zero-sum hand return detected: {returns}")
     return returns
 
 
+def run_hands_vectorized(num_hands: int, rng: np.random.Generator) -> np.ndarray:
+    """Random-legal self-play over a batch; rewards are [n, 2] and checked for zero-sum."""
+    returns = run_hands_batch(num_hands, rng)
+    if not np.allclose(returns.sum(axis=1), 0.0):
+        raise RuntimeError("Non zero-sum hand return detected in batched rollout.")
+    return returns
+
+
 def main() -> None:
     args = parse_args()
     rng = np.random.default_rng(args.seed)
-    env = KuhnPokerAECEnv()
 
-    totals = {agent: 0.0 for agent in AGENT_NAMES}
-    for _ in range(args.hands):
-        hand_returns = run_hand(env, rng)
-        for agent in AGENT_NAMES:
-            totals[agent] += hand_returns[agent]
+    if args.per_hand:
+        env = KuhnPokerAECEnv()
+        totals = np.zeros(len(AGENT_NAMES))
+        for _ in range(args.hands):
+            totals += run_hand(env, rng)
+    else:
+        totals = run_hands_vectorized(args.hands, rng).sum(axis=0)
 
     print(f"Smoke test passed for {args.hands} hands.")
     print(
-        f"Average return: {AGENT_NAMES[0]}={totals[AGENT_NAMES[0]] / args.hands:.3f}, "
-        f"{AGENT_NAMES[1]}={totals[AGENT_NAMES[1]] / args.hands:.3f}"
+        f"Average return: {AGENT_NAMES[0]}={totals[0] / args.hands:.3f}, "
+        f"{AGENT_NAMES[1]}={totals[1] / args.hands:.3f}"
     )
 
 
@@ -12,6 +12,14 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from kuhn_poker.onnx_export import export_maskable_ppo_to_torchscript
+from kuhn_poker.policy_table import (
+    EXPORTS_DIGEST_SUFFIX,
+    POLICY_TABLE_SUFFIX,
+    checkpoint_digest,
+    decision_point_probabilities,
+    save_policy_table,
+)
 from kuhn_poker.wrappers import make_masked_sb3_env
 
 
@@ -50,10 +58,25 @@ def main() -> None:
 
     args.model_out.parent.mkdir(parents=True, exist_ok=True)
     model.save(args.model_out)
+    # Inference-only copy that play_cli can load without unpacking the SB3 zip.
+    traced_path = export_maskable_ppo_to_torchscript(
+        model, args.model_out.with_name(f"{args.model_out.name}.pt")
+    )
+    # The whole policy as a table; eval and the CLI act from it with NumPy alone.
+    table_path = save_policy_table(
+        args.model_out.with_name(f"{args.model_out.name}{POLICY_TABLE_SUFFIX}"),
+        decision_point_probabilities(model),
+    )
+    # Written last: play_cli only trusts the exports while the .zip still has this hash.
+    args.model_out.with_name(f"{args.model_out.name}{EXPORTS_DIGEST_SUFFIX}").write_text(
+        checkpoint_digest(args.model_out.with_name(f"{args.model_out.name}.zip")) + "\n"
+    )
     env.close()
 
     print(f"Training complete. Timesteps: {args.total_timesteps}")
     print(f"Model saved to: {args.model_out}.zip")
+    print(f"Traced policy saved to: {traced_path}")
+    print(f"Policy table saved to: {table_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from kuhn_poker.batch_sim import (
+    LEGAL_MASK_BY_HISTORY,
+    MAX_HISTORY_DEPTH,
+    heuristic_policy,
+    random_legal_policy,
+    run_hands_batch,
+)
+from kuhn_poker.constants import CARD_LABELS
+from kuhn_poker.opponents import simple_heuristic_action
+from kuhn_poker.tables import HISTORY_NODES, HandPhase
+
+
+def test_batched_hands_are_zero_sum_with_legal_payoffs() -> None:
+    returns = run_hands_batch(25_000, np.random.default_rng(0))
+
+    assert returns.shape == (25_000, 2)
+    assert np.allclose(returns.sum(axis=1), 0.0)
+    assert set(np.unique(returns[:, 0])) <= {-2.0, -1.0, 1.0, 2.0}
+
+
+def test_batched_heuristic_matches_scalar_heuristic() -> None:
+    live = [
+        (history_id, sequence)
+        for history_id, (sequence, phase) in enumerate(HISTORY_NODES)
+        if phase != HandPhase.TERMINAL
+    ]
+    for card in range(len(CARD_LABELS)):
+        cards = np.full(len(live), card, dtype=np.int8)
+        history_ids = np.array([history_id for history_id, _ in live])
+        masks = LEGAL_MASK_BY_HISTORY[history_ids]
+
+        batched = heuristic_policy(cards, history_ids, masks, np.random.default_rng(0))
+        expected = [
+            simple_heuristic_action(card, list(sequence), mask)
+            for (_, sequence), mask in zip(live, masks)
+        ]
+        assert batched.tolist() == expected
+
+
+def test_random_legal_policy_only_picks_legal_actions() -> None:
+    masks = np.array([[1, 1, 0], [1, 0, 1]] * 500, dtype=np.int8)
+    actions = random_legal_policy(
+        np.zeros(len(masks), dtype=np.int8),
+        np.zeros(len(masks), dtype=np.int64),
+        masks,
+        np.random.default_rng(0),
+    )
+
+    assert np.all(masks[np.arange(len(masks)), actions] == 1)
+    assert set(actions[0::2].tolist()) == {0, 1}
+    assert set(actions[1::2].tolist()) == {0, 2}
+
+
+def test_batched_rollout_rejects_illegal_policy_actions() -> None:
+    def always_fold(cards, histories, masks, rng):
+        return np.full(len(histories), 2)
+
+    with pytest.raises(ValueError, match="illegal action"):
+        run_hands_batch(10, np.random.default_rng(0), policies=(always_fold, always_fold))
+
+
+def test_max_history_depth_covers_longest_hand() -> None:
+    # check, bet, call/fold is the longest public action sequence.
+    assert MAX_HISTORY_DEPTH == 3
@@ -6,28 +6,39 @@ import sys
 from pathlib import Path
 
 from kuhn_poker.generated import contract as generated
+from scripts import generate_contract_bindings
 
 
 def test_generated_bindings_are_in_sync() -> None:
+    ok, message = generate_contract_bindings.check()
+    assert ok, message
+
+
+def test_schema_violations_are_reported_with_paths(tmp_path: Path) -> None:
     repo_root = Path(__file__).resolve().parents[1]
-    command = [
-        sys.executable,
-        "scripts/generate_contract_bindings.py",
-        "--check",
-    ]
+    with (repo_root / "contracts" / "kuhn.v1.json").open("r", encoding="utf-8") as f:
+        contract = json.load(f)
+    contract["actions"][0]["id"] = "zero"
+    invalid_path = tmp_path / "invalid.json"
+    invalid_path.write_text(json.dumps(contract), encoding="utf-8")
+
     result = subprocess.run(
-        command,
+        [
+            sys.executable,
+            "scripts/generate_contract_bindings.py",
+            "--check",
+            "--contract-path",
+            str(invalid_path),
+        ],
         cwd=repo_root,
         capture_output=True,
         text=True,
         check=False,
     )
 
-    assert result.returncode == 0, (
-        "Contract bindings are out of sync.\n"
-        f"stdout:\n{result.stdout}\n"
-        f"stderr:\n{result.stderr}"
-    )
+    assert result.returncode != 0
+    assert "Contract schema validation failed:" in result.stderr
+    assert "- actions.0.id:" in result.stderr
 
 
 def test_generated_contract_core_values_match_source() -> None:
@@ -41,3 +52,19 @@ def test_generated_contract_core_values_match_source() -> None:
     assert len(source["actions"]) == generated.ACTION_DIM
     assert source["observation"]["size"] == generated.OBSERVATION_DIM
     assert source["observation"]["terminal_history_index"] == generated.OBS_TERMINAL_HISTORY_INDEX
+
+
+def test_legal_mask_matrix_rows_match_phase_masks() -> None:
+    assert generated.LEGAL_MASK_MATRIX.shape == (len(generated.PHASES), generated.ACTION_DIM)
+    assert not generated.LEGAL_MASK_MATRIX.flags.writeable
+    for phase, mask in generated.LEGAL_MASK_BY_PHASE.items():
+        row = generated.LEGAL_MASK_MATRIX[generated.PHASE_INDEX_BY_NAME[phase]]
+        assert tuple(row.tolist()) == mask
+
+
+def test_legal_mask_bits_encode_phase_masks() -> None:
+    for phase_index, phase in enumerate(generated.PHASES):
+        bits = generated.LEGAL_MASK_BITS_BY_PHASE[phase]
+        assert generated.LEGAL_MASK_BITS_BY_PHASE_INDEX[phase_index] == bits
+        unpacked = tuple((bits >> action_id) & 1 for action_id in range(generated.ACTION_DIM))
+        assert unpacked == generated.LEGAL_MASK_BY_PHASE[phase]
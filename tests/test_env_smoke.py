@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import numpy as np
 
-from kuhn_poker.constants import AGENT_NAMES
+from kuhn_poker.constants import AGENT_INDEX, AGENT_NAMES
 from kuhn_poker.env import KuhnPokerAECEnv
 from kuhn_poker.opponents import sample_random_legal_action
 
@@ -10,18 +10,20 @@ from kuhn_poker.opponents import sample_random_legal_action
 def test_env_random_play_is_zero_sum() -> None:
     env = KuhnPokerAECEnv()
     rng = np.random.default_rng(0)
+    num_hands = 25
+    returns = np.zeros((num_hands, len(AGENT_NAMES)))
 
-    for _ in range(25):
-        returns = {agent: 0.0 for agent in AGENT_NAMES}
-        env.reset()
-        for agent in env.agent_iter(max_iter=10):
-            obs, reward, termination, truncation, _ = env.last()
-            returns[agent] += reward
+    for hand in range(num_hands):
+        env.quick_reset()
+        while env.agents:
+            agent = env.agent_selection
+            obs, reward, termination, truncation, info = env.last()
+            returns[hand, AGENT_INDEX[agent]] += reward
             if termination or truncation:
                 action = None
             else:
-                assert int(np.sum(obs["action_mask"])) > 0
+                assert info["action_mask_bits"].bit_count() > 0
                 action = sample_random_legal_action(obs["action_mask"], rng)
             env.step(action)
 
-        assert np.isclose(sum(returns.values()), 0.0)
+    assert np.allclose(returns.sum(axis=1), 0.0)
@@ -3,7 +3,7 @@ from __future__ import annotations
 import numpy as np
 
 from kuhn_poker.constants import AGENT_NAMES, CARD_J, CARD_K, Action
-from kuhn_poker.env import KuhnPokerAECEnv
+from kuhn_poker.env import DECISION_POINTS, KuhnPokerAECEnv
 from kuhn_poker.generated.contract import (
     OBS_ACTOR_DIM,
     OBS_ACTOR_OFFSET,
@@ -13,6 +13,7 @@ from kuhn_poker.generated.contract import (
     OBS_PRIVATE_CARD_DIM,
     OBS_PRIVATE_CARD_OFFSET,
 )
+from kuhn_poker.opponents import sample_random_legal_action
 
 CARD_SLICE = slice(OBS_PRIVATE_CARD_OFFSET, OBS_PRIVATE_CARD_OFFSET + OBS_PRIVATE_CARD_DIM)
 HISTORY_SLICE = slice(OBS_HISTORY_OFFSET, OBS_HISTORY_OFFSET + OBS_HISTORY_DIM)
@@ -76,3 +77,67 @@ def test_terminal_observation_uses_terminal_history_and_no_actor() -> None:
         )
         assert np.array_equal(obs["observation"][ACTOR_SLICE], np.array([0, 0], dtype=np.int8))
         assert np.array_equal(obs["action_mask"], np.array([0, 0, 0], dtype=np.int8))
+
+
+def test_observations_and_action_masks_are_read_only() -> None:
+    env = KuhnPokerAECEnv()
+    env.reset(seed=0)
+
+    for agent in AGENT_NAMES:
+        obs = env.observe(agent)
+        mask = obs["action_mask"]
+        assert not obs["observation"].flags.writeable
+        assert not mask.flags.writeable
+        assert env.infos[agent]["action_mask"] is mask
+
+
+def test_observe_returns_shared_arrays_without_rebuilding() -> None:
+    env = KuhnPokerAECEnv()
+    env.reset(seed=0)
+    other_env = KuhnPokerAECEnv()
+    other_env.reset(seed=0)
+
+    for agent in AGENT_NAMES:
+        first, second = env.observe(agent), env.observe(agent)
+        assert first["observation"] is second["observation"]
+        assert first["action_mask"] is second["action_mask"]
+        assert first["observation"] is other_env.observe(agent)["observation"]
+
+
+def test_action_mask_bits_match_action_mask() -> None:
+    env = KuhnPokerAECEnv()
+    rng = np.random.default_rng(0)
+    for seed in range(40):
+        env.reset(seed=seed)
+        for agent in env.agent_iter(max_iter=10):
+            obs, _, termination, truncation, _ = env.last()
+            for info in env.infos.values():
+                mask = info["action_mask"]
+                expected_bits = sum(1 << action for action in np.flatnonzero(mask).tolist())
+                assert info["action_mask_bits"] == expected_bits
+            if termination or truncation:
+                env.step(None)
+                continue
+            env.step(sample_random_legal_action(obs["action_mask"], rng))
+
+
+def test_decision_points_cover_every_live_observation() -> None:
+    env = KuhnPokerAECEnv()
+    env.reset(seed=0)
+    rng = np.random.default_rng(0)
+    seen = set()
+    for _ in range(300):
+        env.reset()
+        for agent in env.agent_iter(max_iter=10):
+            obs, _, termination, truncation, _ = env.last()
+            if termination or truncation:
+                env.step(None)
+                continue
+            seen.add((obs["observation"].tobytes(), obs["action_mask"].tobytes()))
+            env.step(sample_random_legal_action(obs["action_mask"], rng))
+
+    expected = {
+        (point.observation.tobytes(), point.action_mask.tobytes()) for point in DECISION_POINTS
+    }
+    assert len(expected) == len(DECISION_POINTS)
+    assert seen == expected
@@ -7,7 +7,16 @@ import pytest
 import torch
 from sb3_contrib import MaskablePPO
 
-from kuhn_poker.onnx_export import MaskablePolicyExportModule, export_maskable_ppo_to_onnx
+from kuhn_poker.env import DECISION_POINTS
+from kuhn_poker.generated.contract import (
+    ONNX_INPUT_ACTION_MASK_NAME,
+    ONNX_INPUT_OBSERVATION_NAME,
+)
+from kuhn_poker.onnx_export import (
+    MaskablePolicyExportModule,
+    export_maskable_ppo_to_onnx,
+    export_maskable_ppo_to_torchscript,
+)
 from kuhn_poker.wrappers import make_masked_sb3_env
 
 onnx = pytest.importorskip("onnx")
@@ -27,23 +36,12 @@ def _build_untrained_model(seed: int = 0) -> tuple[MaskablePPO, object]:
     return model, env
 
 
-def _sample_obs_and_masks(num_samples: int = 8) -> list[tuple[np.ndarray, np.ndarray]]:
-    env = make_masked_sb3_env(seed=1)
-    samples: list[tuple[np.ndarray, np.ndarray]] = []
-    observation, _ = env.reset(seed=1)
-
-    while len(samples) < num_samples:
-        action_mask = env.action_masks().astype(np.float32)
-        samples.append((observation.astype(np.float32), action_mask))
-
-        legal_actions = np.flatnonzero(action_mask)
-        action = int(legal_actions[0])
-        observation, _, terminated, truncated, _ = env.step(action)
-        if terminated or truncated:
-            observation, _ = env.reset()
-
-    env.close()
-    return samples
+@pytest.fixture(scope="module")
+def decision_point_batch() -> tuple[np.ndarray, np.ndarray]:
+    """Every live (observation, action mask) pair, as float32 model inputs."""
+    observations = np.stack([point.observation for point in DECISION_POINTS])
+    action_masks = np.stack([point.action_mask for point in DECISION_POINTS])
+    return observations.astype(np.float32), action_masks.astype(np.float32)
 
 
 def test_export_creates_valid_onnx_model(tmp_path: Path) -> None:
@@ -58,7 +56,19 @@ def test_export_creates_valid_onnx_model(tmp_path: Path) -> None:
     env.close()
 
 
-def test_exported_onnx_matches_torch_outputs(tmp_path: Path) -> None:
+def test_export_module_dummy_inputs_match_policy_dims() -> None:
+    model, env = _build_untrained_model(seed=4)
+    export_module = MaskablePolicyExportModule(model)
+
+    assert tuple(export_module.dummy_observation.shape) == (1, model.observation_space.shape[0])
+    assert tuple(export_module.dummy_action_mask.shape) == (1, model.action_space.n)
+    assert not any(key.startswith("dummy_") for key in export_module.state_dict())
+    env.close()
+
+
+def test_exported_onnx_matches_torch_outputs(
+    tmp_path: Path, decision_point_batch: tuple[np.ndarray, np.ndarray]
+) -> None:
     model, env = _build_untrained_model(seed=3)
     onnx_path = tmp_path / "kuhn_policy.onnx"
     export_maskable_ppo_to_onnx(model=model, onnx_path=onnx_path)
@@ -67,23 +77,42 @@ def test_exported_onnx_matches_torch_outputs(tmp_path: Path) -> None:
         str(onnx_path), providers=["CPUExecutionProvider"]
     )
     export_module = MaskablePolicyExportModule(model).eval()
-    samples = _sample_obs_and_masks(num_samples=10)
-
-    for observation, action_mask in samples:
-        observation_batch = observation.reshape(1, -1).astype(np.float32)
-        action_mask_batch = action_mask.reshape(1, -1).astype(np.float32)
-
-        with torch.no_grad():
-            torch_logits, torch_value = export_module(
-                torch.from_numpy(observation_batch),
-                torch.from_numpy(action_mask_batch),
-            )
-        ort_logits, ort_value = session.run(
-            None,
-            {"observation": observation_batch, "action_mask": action_mask_batch},
+    observation_batch, action_mask_batch = decision_point_batch
+
+    # The export declares a dynamic batch axis, so all samples go through in one run.
+    with torch.no_grad():
+        torch_logits, torch_value = export_module(
+            torch.from_numpy(observation_batch),
+            torch.from_numpy(action_mask_batch),
         )
+    ort_logits, ort_value = session.run(
+        None,
+        {
+            ONNX_INPUT_OBSERVATION_NAME: observation_batch,
+            ONNX_INPUT_ACTION_MASK_NAME: action_mask_batch,
+        },
+    )
+
+    assert np.allclose(ort_logits, torch_logits.numpy(), atol=1e-4, rtol=1e-4)
+    assert np.allclose(ort_value, torch_value.numpy(), atol=1e-4, rtol=1e-4)
+
+    env.close()
+
+
+def test_traced_policy_matches_torch_outputs(
+    tmp_path: Path, decision_point_batch: tuple[np.ndarray, np.ndarray]
+) -> None:
+    model, env = _build_untrained_model(seed=5)
+    traced_path = export_maskable_ppo_to_torchscript(model, tmp_path / "kuhn_policy.pt")
+
+    traced = torch.jit.load(str(traced_path))
+    export_module = MaskablePolicyExportModule(model).eval()
+    observations, action_masks = map(torch.from_numpy, decision_point_batch)
 
-        assert np.allclose(ort_logits, torch_logits.numpy(), atol=1e-4, rtol=1e-4)
-        assert np.allclose(ort_value, torch_value.numpy(), atol=1e-4, rtol=1e-4)
+    with torch.no_grad():
+        traced_logits, traced_value = traced(observations, action_masks)
+        torch_logits, torch_value = export_module(observations, action_masks)
 
+    assert torch.allclose(traced_logits, torch_logits)
+    assert torch.allclose(traced_value, torch_value)
     env.close()
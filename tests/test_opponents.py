@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import numpy as np
+import pytest
 
 from kuhn_poker.constants import CARD_J, CARD_K, Action
-from kuhn_poker.opponents import sample_random_legal_action, simple_heuristic_action
+from kuhn_poker.opponents import (
+    LEGAL_ACTIONS,
+    sample_random_legal_action,
+    simple_heuristic_action,
+)
 
 
 def test_random_opponent_samples_legal_action() -> None:
@@ -12,6 +17,18 @@ def test_random_opponent_samples_legal_action() -> None:
     assert mask[action] == 1
 
 
+def test_random_opponent_is_uniform_over_every_mask() -> None:
+    rng = np.random.default_rng(2)
+    for bits, legal_actions in enumerate(LEGAL_ACTIONS[1:], start=1):
+        mask = np.array([bits >> action & 1 for action in range(3)], dtype=np.int8)
+        assert legal_actions == tuple(np.flatnonzero(mask).tolist())
+        counts = np.bincount(
+            [sample_random_legal_action(mask, rng) for _ in range(3_000)], minlength=3
+        )
+        assert np.all(counts[mask == 0] == 0)
+        assert np.allclose(counts[mask == 1] / 3_000, 1 / len(legal_actions), atol=0.04)
+
+
 def test_heuristic_plays_strong_and_weak_cards() -> None:
     passive_mask = np.array([1, 1, 0], dtype=np.int8)
     facing_bet_mask = np.array([1, 0, 1], dtype=np.int8)
@@ -22,3 +39,12 @@ def test_heuristic_plays_strong_and_weak_cards() -> None:
     assert (
         simple_heuristic_action(CARD_J, ["bet"], facing_bet_mask) == int(Action.FOLD)
     )
+
+
+def test_opponents_reject_empty_mask() -> None:
+    empty_mask = np.zeros(3, dtype=np.int8)
+
+    with pytest.raises(ValueError, match="No legal actions"):
+        sample_random_legal_action(empty_mask, np.random.default_rng(0))
+    with pytest.raises(ValueError, match="No legal actions"):
+        simple_heuristic_action(CARD_K, ["bet"], empty_mask)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sb3_contrib import MaskablePPO
+
+from kuhn_poker.batch_sim import random_legal_policy, run_hands_batch
+from kuhn_poker.constants import ACTION_DIM
+from kuhn_poker.env import DECISION_POINTS
+from kuhn_poker.policy_table import (
+    DECISION_POINT_MASKS,
+    decision_point_probabilities,
+    load_policy_table,
+    save_policy_table,
+    table_batch_policy,
+)
+from kuhn_poker.wrappers import make_masked_sb3_env
+
+
+def _random_table(rng: np.random.Generator) -> np.ndarray:
+    return rng.random((len(DECISION_POINTS), ACTION_DIM)) * DECISION_POINT_MASKS
+
+
+def test_model_probabilities_are_masked_distributions() -> None:
+    env = make_masked_sb3_env(seed=0)
+    model = MaskablePPO(policy="MlpPolicy", env=env, seed=0, n_steps=64, batch_size=64)
+
+    probs = decision_point_probabilities(model)
+
+    assert probs.shape == (len(DECISION_POINTS), ACTION_DIM)
+    assert np.allclose(probs.sum(axis=1), 1.0)
+    assert np.all(probs[DECISION_POINT_MASKS == 0] == 0.0)
+    env.close()
+
+
+def test_policy_table_round_trips_and_rejects_bad_shapes(tmp_path: Path) -> None:
+    probs = _random_table(np.random.default_rng(0))
+
+    path = save_policy_table(tmp_path / "bot.policy.npy", probs)
+
+    assert path.name == "bot.policy.npy"
+    assert np.allclose(load_policy_table(path), probs / probs.sum(axis=1, keepdims=True))
+    np.save(tmp_path / "bad.npy", probs[:-1])
+    with pytest.raises(ValueError, match="shape"):
+        load_policy_table(tmp_path / "bad.npy")
+
+
+def test_table_batch_policy_plays_greedy_and_sampled_legal_actions() -> None:
+    rng = np.random.default_rng(1)
+    probs = _random_table(rng)
+    cards = np.array([point.private_card for point in DECISION_POINTS])
+    history_ids = np.array([point.history_id for point in DECISION_POINTS])
+
+    greedy = table_batch_policy(probs)(cards, history_ids, DECISION_POINT_MASKS, rng)
+    assert np.array_equal(greedy, probs.argmax(axis=1))
+
+    sampled = table_batch_policy(probs, deterministic=False)
+    for _ in range(50):
+        actions = sampled(cards, history_ids, DECISION_POINT_MASKS, rng)
+        assert np.all(DECISION_POINT_MASKS[np.arange(len(actions)), actions] == 1)
+
+    returns = run_hands_batch(2_000, rng, policies=(sampled, random_legal_policy))
+    assert np.allclose(returns.sum(axis=1), 0.0)
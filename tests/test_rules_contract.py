@@ -3,8 +3,9 @@ from __future__ import annotations
 import numpy as np
 import pytest
 
-from kuhn_poker.constants import AGENT_NAMES, CARD_J, CARD_K, Action
+from kuhn_poker.constants import ACTION_DIM, AGENT_NAMES, CARD_J, CARD_K, Action
 from kuhn_poker.env import KuhnPokerAECEnv
+from kuhn_poker.generated.contract import ACTION_ID_BY_NAME
 
 
 def _run_hand(cards: tuple[int, int], actions: list[int]) -> tuple[dict[str, float], list[str]]:
@@ -84,6 +85,14 @@ def test_illegal_fold_before_bet_raises() -> None:
         env.step(int(Action.FOLD))
 
 
+@pytest.mark.parametrize("action", [-1, ACTION_DIM])
+def test_out_of_range_action_raises(action: int) -> None:
+    env = KuhnPokerAECEnv()
+    env.reset(seed=0)
+    with pytest.raises(ValueError, match=r"Illegal action .* Legal mask: \[1, 1, 0\]"):
+        env.step(action)
+
+
 def test_legal_masks_match_betting_state() -> None:
     env = KuhnPokerAECEnv()
     env.reset(seed=0)
@@ -98,3 +107,7 @@ def test_legal_masks_match_betting_state() -> None:
     env.step(int(Action.BET))
     obs = env.observe(AGENT_NAMES[0])
     assert np.array_equal(obs["action_mask"], np.array([1, 0, 1], dtype=np.int8))
+
+
+def test_action_enum_matches_contract_ids() -> None:
+    assert {action.name: int(action) for action in Action} == ACTION_ID_BY_NAME
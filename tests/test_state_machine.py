@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-from kuhn_poker.constants import AGENT_NAMES, Action
+import numpy as np
+
+from kuhn_poker.constants import AGENT_NAMES, CARD_LABELS, Action
 from kuhn_poker.env import HandPhase, KuhnPokerAECEnv
 
 
 def test_reset_starts_at_p0_act_phase() -> None:
     env = KuhnPokerAECEnv()
+    assert env.phase == HandPhase.DEAL
+
     env.reset(seed=0)
 
     assert env.phase == HandPhase.P0_ACT
     assert env.agent_selection == AGENT_NAMES[0]
+    assert all(info["phase"] == HandPhase.P0_ACT.value for info in env.infos.values())
 
 
 def test_check_bet_call_phase_path() -> None:
@@ -40,3 +45,59 @@ def test_bet_fold_phase_path() -> None:
     env.step(int(Action.FOLD))
     assert env.phase == HandPhase.TERMINAL
     assert all(env.terminations.values())
+
+
+def test_reset_deals_two_distinct_cards() -> None:
+    env = KuhnPokerAECEnv()
+    env.reset(seed=0)
+
+    for _ in range(50):
+        env.reset()
+        p0_card, p1_card = (env.private_cards[agent] for agent in AGENT_NAMES)
+        assert p0_card != p1_card
+        assert 0 <= p0_card < len(CARD_LABELS)
+        assert 0 <= p1_card < len(CARD_LABELS)
+
+
+def test_quick_reset_matches_reset() -> None:
+    slow_env, quick_env = KuhnPokerAECEnv(), KuhnPokerAECEnv()
+    slow_env.reset(seed=3)
+    quick_env.reset(seed=3)
+
+    for hand in range(30):
+        # Leave some hands unfinished and finish the rest, including the dead steps.
+        for _ in range(hand % 5):
+            for env in (slow_env, quick_env):
+                if env.agents:
+                    obs, _, termination, truncation, _ = env.last()
+                    live = not (termination or truncation)
+                    env.step(int(obs["action_mask"].argmax()) if live else None)
+
+        slow_env.reset()
+        quick_env.quick_reset()
+
+        assert quick_env.agents == slow_env.agents
+        assert quick_env.private_cards == slow_env.private_cards
+        assert quick_env.contributions == slow_env.contributions
+        assert quick_env.phase == slow_env.phase
+        assert quick_env.agent_selection == slow_env.agent_selection
+        assert quick_env.terminations == slow_env.terminations
+        assert quick_env.truncations == slow_env.truncations
+        assert quick_env.rewards == slow_env.rewards
+        assert quick_env.infos.keys() == slow_env.infos.keys()
+        for agent in AGENT_NAMES:
+            quick_obs, slow_obs = quick_env.observe(agent), slow_env.observe(agent)
+            assert np.array_equal(quick_obs["observation"], slow_obs["observation"])
+            assert np.array_equal(quick_obs["action_mask"], slow_obs["action_mask"])
+            assert quick_env.infos[agent] == {
+                **slow_env.infos[agent],
+                "action_mask": quick_obs["action_mask"],
+            }
+
+
+def test_quick_reset_before_reset_falls_back_to_reset() -> None:
+    env = KuhnPokerAECEnv()
+    env.quick_reset()
+
+    assert env.phase == HandPhase.P0_ACT
+    assert env.agents == list(AGENT_NAMES)
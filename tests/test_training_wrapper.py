@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import numpy as np
 
+from kuhn_poker.env import KuhnPokerAECEnv
 from kuhn_poker.generated.contract import ACTION_DIM, OBSERVATION_DIM
-from kuhn_poker.wrappers import make_masked_sb3_env
+from kuhn_poker.opponents import sample_random_legal_action
+from kuhn_poker.wrappers import KuhnCoreEnv, SB3ActionMaskWrapper, make_masked_sb3_env
 
 
 def test_masked_sb3_env_reset_step_and_masks() -> None:
@@ -28,3 +30,31 @@ def test_masked_sb3_env_reset_step_and_masks() -> None:
         assert int(np.sum(next_mask)) >= 1
 
     env.close()
+
+
+def test_core_env_matches_aec_wrapper_step_for_step() -> None:
+    core_env = KuhnCoreEnv()
+    aec_env = SB3ActionMaskWrapper(KuhnPokerAECEnv())
+    rng = np.random.default_rng(0)
+
+    for seed in range(40):
+        core_obs, core_info = core_env.reset(seed=seed)
+        aec_obs, aec_info = aec_env.reset(seed=seed)
+        assert np.array_equal(core_obs, aec_obs)
+        assert core_info["phase"] == aec_info["phase"]
+
+        done = False
+        while not done:
+            core_mask = core_env.action_masks()
+            assert np.array_equal(core_mask, aec_env.action_mask())
+
+            action = sample_random_legal_action(core_mask, rng)
+            core_step = core_env.step(action)
+            aec_step = aec_env.step(action)
+
+            assert np.array_equal(core_step[0], aec_step[0])
+            assert core_step[1:4] == aec_step[1:4]
+            assert np.array_equal(core_step[4]["action_mask"], aec_step[4]["action_mask"])
+            assert core_step[4]["phase"] == aec_step[4]["phase"]
+            assert core_step[4]["action_mask_bits"] == aec_step[4]["action_mask_bits"]
+            done = core_step[2]
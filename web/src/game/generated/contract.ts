@@ -137,6 +137,15 @@ export const LEGAL_MASK_BY_PHASE = {
   ]
 } as const satisfies Record<Phase, ActionMask>
 export const NO_LEGAL_ACTION_MASK = LEGAL_MASK_BY_PHASE[TERMINAL_PHASE]
+// Bit i is set when action id i is legal: (bits >> actionId) & 1.
+export const LEGAL_MASK_BITS_BY_PHASE = {
+  "deal": 0,
+  "p0_act": 3,
+  "p1_act": 3,
+  "p0_response": 5,
+  "p1_response": 5,
+  "terminal": 0
+} as const satisfies Record<Phase, number>
 
 export const OBSERVATION_DIM = 10 as const
 export const OBS_PRIVATE_CARD_OFFSET = 0 as const